@@ -1,4 +1,5 @@
 # __main__.py
+import json
 import logging
 import os
 import sys
@@ -34,6 +35,7 @@ def main():
             "    --reset: completely erases all data\n"
             "    --reset-config: only erase config\n"
             "    --import [/path/to/file]: imports a playlist from a file and downloads all songs\n"
+            "    --export-db [/path/to/file]: writes the song database as json (eg. to switch back from sqlite storage)\n"
             "    --gui / -g: launch using a Qt GUI\n"
             "    -s / --start [mode]: immediately start playing\n"
             "       mode can be random or r to play all songs shuffled,\n"
@@ -61,11 +63,10 @@ def main():
     if "--clean" in params:
         print("clearing songdir")
 
-        # a list of all songs currently in any playlist
-        all_songs: list[str] = []
-        for playlist in lib.playlists.val.values():
-            all_songs.extend(playlist.val)
-        
+        # all songs currently in any playlist
+        all_songs = lib.playlist_index.songs()
+        unused: list[str] = []  # the songs removed from the database at once in the end
+
         # every file in song_dir (where the .mp3s are stored) is checked
         with os.scandir(lib.song_dir) as files:
             for file in files:
@@ -75,25 +76,44 @@ def main():
                     # if metadata about the song is known
                     if file.stem in lib.song_data.val:
                         # print a pretty remove notification
-                        print(f"removing {lib.song_data.val[file.stem]['title']}")
+                        print(f"removing {lib.song_data.val[file.stem].title}")
                         # and also remove the metadata
-                        del lib.song_data.val[file.stem]
+                        unused.append(file.stem)
                     # if there is no metadata (potentially some download artifacts)
                     else:
                         # just print the name of the file
                         print(f"removing {file}")
                     os.remove(file)
-        # every song in song_data -> every song which has metadata
-        all_songs_in_db = list(lib.song_data.val.keys())
-        for song in all_songs_in_db:
-            # if the song is no longer in any playlist
-            if song not in all_songs:
-                # print a notification
-                print(f"removing {lib.song_data.val[song]['title']} from database")
-                # and remove metadata
-                del lib.song_data.val[song]
+        # leftovers of interrupted downloads
+        with os.scandir(lib.download_dir) as files:
+            for file in files:
+                print(f"removing {file.path}")
+                os.remove(file)
+        # every song in song_data (every song which has metadata) that is no longer in any playlist
+        known = set(unused)
+        for song in lib.songs_not_in(all_songs):
+            if song in known:  # the file was removed already
+                continue
+            # print a notification
+            print(f"removing {lib.song_data.val[song].title} from database")
+            # and remove metadata
+            unused.append(song)
+        lib.delete_songs(unused)
         # save the metadata
-        lib.data.save_all()
+        lib.saver.flush()
+        return
+
+    # writes the song db to a json file
+    if "--export-db" in params:
+        try:
+            file = Path(params[params.index("--export-db") + 1])
+        except IndexError:
+            file = lib.data_dir.joinpath("data")  # the location of the json db
+        if isinstance(lib.song_data.val, lib.SongDB):
+            lib.song_data.val.export_json(file)
+        else:
+            lib.data.save(lib.song_data, file)
+        print(f"exported {len(lib.song_data.val)} songs to {file}")
         return
 
     # an option to point to an playlistfile and add it (with downloading all relevant info)
@@ -106,30 +126,36 @@ def main():
             print("could not find file. try specifying it with eg. --import /path/to/file")
             return
         assert file.is_file(), "please point to a file" # das file sollte auch ein file sein (kein folder)
-        # the temporary playlist
-        playlist = lib.Pointer([])
-        # loads the content of the file to the playlist var
+        # reads the content of the file
         try:
-            lib.data.load(file, playlist)
-        except:
+            with open(file, "r") as f:
+                songs = json.load(f)
+        except (OSError, ValueError):
             print("Not a valid playlistfile")
             return
         # make sure the loaded playlist is a list[str]
-        assert type(playlist.val) == list, "Not a valid playlistfile"
-        assert all([type(x) is str for x in playlist.val]), "Not a valid playlistfile"
+        assert type(songs) == list, "Not a valid playlistfile"
+        assert all([type(x) is str for x in songs]), "Not a valid playlistfile"
         # copy the file to the playlist folder
         copy2(file, lib.playlist_dir)
-        # downloads each song
-        for song in playlist.val:
-            song_info = lib.yt.get_song(song)["videoDetails"]
-            # also prints the current track to download
-            print(f"\rdownloading {song_info['title']}", end="")
-            lib.download_song(song_info)
-            print(" " * (len(song_info['title']) + 13), end="")
+        # and load the copy as the playlist, so changes are saved there (and not next to the imported file)
+        playlist = lib.Playlist()
+        lib.data.load(lib.playlist_dir.joinpath(file.name), playlist)
+        # downloads all songs (several at once), an interrupted import continues with the songs that are still missing
+        importer = lib.Importer(file.stem, playlist.val)
+
+        def progress(done: int, total: int, song: lib.Song | None):
+            # prints the last imported track
+            title = song.title if song is not None else "failed"
+            print(f"\r\033[K[{done}/{total}] {title}", end="", flush=True)
+
+        importer.run(progress)
+        print()
+        print(importer.report())
         # adds the playlist to the playlists variable
         lib.playlists.val[file.stem] = playlist
         # saves all info
-        lib.data.save_all()
+        lib.saver.flush()
         return
 
     # an option to instantly start playing
@@ -146,18 +172,17 @@ def main():
             # r -> shuffle all songs
             case "random" | "r":
                 def start() -> None:
-                    lib.music_player.add_list(list(map(lib.song_file, lib.song_data.val.keys())))
+                    lib.music_player.add_list(lib.song_data.val.keys())
                     lib.music_player.shuffle()
             # s -> play all songs
             case "start" | "s":
                 def start() -> None:
-                    lib.music_player.add_list(list(map(lib.song_file, lib.song_data.val.keys())))
+                    lib.music_player.add_list(lib.song_data.val.keys())
             # for anything else it is checked if mode matches a playlistname to play (in order)
             case _:
-                for playlist in lib.playlists.val.keys():
-                    if mode == playlist:
-                        def start() -> None:
-                            lib.music_player.add_list(list(map(lib.song_file, lib.playlists.val[playlist])))
+                if mode in lib.playlists.val:
+                    def start() -> None:
+                        lib.music_player.add_list(lib.playlists.val[mode].val)  # only this playlist is loaded
 
     # creates a decoy start function
     if 'start' not in globals():
@@ -1,16 +1,28 @@
 import _curses
+import copy
 import curses
+import hashlib
+import itertools
+import queue
 import sys
 import json
 import os
 import random
 import re
 import shutil
+import sqlite3
+import subprocess
+import threading
 import time
 import logging
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Callable, Iterable, Literal
+from typing import Any, Callable, Container, Iterable, Literal
 
+import requests
 import yt_dlp
 import ytmusicapi
 import vlc
@@ -19,57 +31,467 @@ import vlc
 main_dir: Path
 song_dir: Path
 data_dir: Path
+download_dir: Path
 playlist_dir: Path
+# placeholder for the Saver, changes are only saved in the background once it exists
+saver: "Saver | None" = None
 
-# a function to circumvent pythons refusal to hash lists (very janky but it works by adding hashvalues of items)
+versions = itertools.count(1)  # the source of Pointer versions
 
 
-def hash_container(container: Iterable) -> int:
-    """hashes a typically unhashable Object (like list or dict by adding all hashes of items)"""
-    hashval = 0
-    for i in container:
-        try:
-            hashval += hash(i)
-        except TypeError:
-            hashval += hash_container(i)
-    return hashval
+class Observable:
+    """a container that reports its modifications to the Pointer holding it as changes like {"op": "append", "value": ...}"""
+    owner: "Pointer | None" = None
+
+    def notify(self, change: dict):
+        if self.owner is not None:
+            self.owner.changed(change)
+
+    def notify_deleted(self, keys: list):
+        """reports deleted keys, a single one as {"op": "del"} and many as a reset"""
+        if len(keys) == 1:
+            self.notify({"op": "del", "key": keys[0]})
+        elif keys:
+            self.notify({"op": "reset"})
+
+
+class ObservableList(Observable, list):
+    """a list reporting its modifications. appending (one or many), removing, moving and setting single items are reported as such,
+    anything else as {"op": "reset"}. removals carry the removed value and setting the replaced one (as "old")"""
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def append(self, value):
+        super().append(value)
+        self.notify({"op": "append", "value": value})
+
+    def insert(self, index: int, value):
+        super().insert(index, value)
+        self.notify({"op": "insert", "index": self.index_of(index, 1), "value": value})
+
+    def index_of(self, index: int, offset: int) -> int:
+        """converts a (negative) index to the position it refers to. offset is the change in length by the modification"""
+        length = len(self) - offset
+        return min(max(index + length if index < 0 else index, 0), length)
+
+    def extend(self, values: Iterable):
+        values = list(values)
+        super().extend(values)
+        self.notify({"op": "extend", "values": values})
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __delitem__(self, index):
+        if isinstance(index, int):
+            value = self[index]
+            super().__delitem__(index)
+            self.notify({"op": "remove", "index": self.index_of(index, -1), "value": value})
+        else:
+            super().__delitem__(index)
+            self.notify({"op": "reset"})
+
+    def pop(self, index: int = -1):
+        value = super().pop(index)
+        self.notify({"op": "remove", "index": self.index_of(index, -1), "value": value})
+        return value
+
+    def remove(self, value):
+        index = self.index(value)
+        del self[index]
+
+    def move(self, source: int, target: int):
+        """moves the item at source to the position target"""
+        list.insert(self, target, list.pop(self, source))
+        self.notify({"op": "move", "from": source, "to": target})
+
+    def __setitem__(self, index, value):
+        if isinstance(index, int):
+            old = self[index]
+            super().__setitem__(index, value)
+            self.notify({"op": "set", "index": self.index_of(index, 0), "value": value, "old": old})
+        else:
+            super().__setitem__(index, value)
+            self.notify({"op": "reset"})
+
+    def reset_after(name: str):  # type: ignore
+        """wraps a list method to report a reset after it ran"""
+        method = getattr(list, name)
+
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self.notify({"op": "reset"})
+            return result
+        wrapper.__name__ = name
+        return wrapper
+
+    clear = reset_after("clear")
+    sort = reset_after("sort")
+    reverse = reset_after("reverse")
+    __imul__ = reset_after("__imul__")
+    del reset_after
+
+
+class ObservableDict(Observable, dict):
+    """a dict reporting its modifications. setting and deleting single keys are reported as such, anything else as {"op": "reset"}"""
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.notify({"op": "set", "key": key, "value": value})
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.notify({"op": "del", "key": key})
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        value = super().pop(key)
+        self.notify({"op": "del", "key": key})
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.notify({"op": "reset"})
+
+    def popitem(self):
+        item = super().popitem()
+        self.notify({"op": "del", "key": item[0]})
+        return item
+
+    def clear(self):
+        super().clear()
+        self.notify({"op": "reset"})
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def delete(self, keys: Iterable):
+        """deletes many keys (skipping missing ones) as a single change"""
+        deleted = [key for key in dict.fromkeys(keys) if key in self]
+        for key in deleted:
+            super().__delitem__(key)
+        self.notify_deleted(deleted)
 
 
 class Pointer:
-    """a VERY bad implementation of pointers. use .val to retrieve or set value"""
+    """holds a value and tells listeners about its modifications. use .val to retrieve or set value.
+    lists and dicts are replaced by observable ones, so their modifications are noticed on their own.
+    other in place modifications (like changing a Song in a dict) have to be reported with changed()"""
 
     def __init__(self, val):
+        self.version: int = 0  # changes with every modification so the Datamanager and UIs know what is outdated
+        self.listeners: list[Callable[[Pointer, dict], Any]] = []  # called with the Pointer and the change after every modification
         self.val = val
 
-    def __hash__(self) -> int:
-        try:
-            return hash(self.val)
-        except:
-            return hash_container(self.val)
+    @property
+    def val(self):
+        return self._val
+
+    @val.setter
+    def val(self, val):
+        if type(val) is list:
+            val = ObservableList(val)
+        elif type(val) is dict:
+            val = ObservableDict(val)
+        if isinstance(val, Observable):
+            val.owner = self
+        self._val = val
+        self.changed()
+
+    def changed(self, change: dict | None = None):
+        """marks the value as modified (and lets the Saver and the listeners know). without a change the whole value counts as changed"""
+        self.version = next(versions)  # a shared counter so concurrent changes can't end up with the same version
+        if saver is not None:
+            saver.request()
+        for listener in self.listeners:
+            listener(self, change or {"op": "reset"})
+
+    def subscribe(self, listener: Callable[["Pointer", dict], Any]):
+        """calls listener(pointer, change) after every modification"""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[["Pointer", dict], Any]):
+        self.listeners.remove(listener)
+
+
+class Playlist(Pointer):
+    """a Pointer to a list of song ids. appending, removing and moving songs are remembered as journal entries,
+    so saving only has to append those to a journal file instead of rewriting the whole playlist"""
+
+    journaled_removals = 16  # remove_songs() journals up to this many removals instead of rewriting the playlist
+
+    def __init__(self, val=None, journaled: bool = True):
+        self.lock = threading.RLock()  # guards the list and the journal as the Saver reads both from another thread
+        self.journaled = journaled  # playlists that are never saved (like the list of all songs) don't keep a journal
+        self.loader: Callable | None = None  # loads the content of the playlist on first access (set by the Datamanager)
+        self.journal: list[dict] = []  # changes that are not saved yet
+        self.rewrite: bool = False  # True if the list was changed in a way the journal can't describe
+        self.base: int = 0  # the checksum of the snapshot file the journal file belongs to
+        self.journal_length: int = 0  # the number of entries in the journal file
+        super().__init__([] if val is None else val)
+
+    @property
+    def val(self) -> ObservableList:
+        with self.lock:
+            if self.loader is not None:  # the playlist is loaded the first time it is needed
+                loader, self.loader = self.loader, None
+                loader()
+            return self._val
+
+    @val.setter
+    def val(self, val: list[str]):
+        self.loader = None  # a value set before loading replaces the file content
+        Pointer.val.fset(self, val)  # type: ignore
+
+    @property
+    def loaded(self) -> bool:
+        """False as long as the content has not been loaded"""
+        return self.loader is None
+
+    def changed(self, change: dict | None = None):
+        """remembers changes the journal can describe, any other change means the playlist has to be rewritten completely"""
+        with self.lock:
+            if self.journaled:
+                match change:
+                    case {"op": "append", "value": song_id}:
+                        self.journal.append({"op": "append", "id": song_id})
+                    case {"op": "extend", "values": song_ids}:
+                        self.journal.extend({"op": "append", "id": song_id} for song_id in song_ids)
+                    case {"op": "remove", "index": index}:
+                        self.journal.append({"op": "remove", "index": index})
+                    case {"op": "move"}:
+                        self.journal.append(change)
+                    case _:
+                        self.rewrite = True
+            super().changed(change)
+
+    def append(self, song_id: str):
+        """adds a song at the end"""
+        with self.lock:
+            self.val.append(song_id)
+
+    def extend(self, song_ids: Iterable[str]):
+        """adds many songs at the end (as a single change)"""
+        with self.lock:
+            self.val.extend(song_ids)
+
+    def remove_at(self, index: int):
+        """removes the song at index"""
+        with self.lock:
+            del self.val[index]
+
+    def remove_songs(self, song_ids: Container[str]) -> int:
+        """removes every occurence of the given songs in one pass and returns how many were removed"""
+        with self.lock:
+            songs = self.val
+            positions = [i for i, song_id in enumerate(songs) if song_id in song_ids]
+            if len(positions) <= self.journaled_removals:  # a few are journaled one by one (from the back so the positions stay valid)
+                for i in reversed(positions):
+                    del songs[i]
+            else:  # many are removed as a single change (which rewrites the playlist file)
+                songs[:] = [song_id for song_id in songs if song_id not in song_ids]
+            return len(positions)
+
+    def move(self, source: int, target: int):
+        """moves the song at source to the position target"""
+        with self.lock:
+            self.val.move(source, target)
+
+    @staticmethod
+    def apply(songs: list[str], entry: dict):
+        """applies a journal entry to a list of song ids"""
+        match entry["op"]:
+            case "append":
+                songs.append(entry["id"])
+            case "remove":
+                del songs[entry["index"]]
+            case "move":
+                songs.insert(entry["to"], songs.pop(entry["from"]))
+            case op:
+                raise ValueError(f"unknown journal entry {op}")
+
+
+class PlaylistIndex:
+    """knows which playlists contain a song (and how often) so library wide operations don't have to search every playlist.
+    it follows the changes of the playlists and is built on first use (which loads all playlists)"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.refs: dict[str, dict[Playlist, int]] = {}  # song id -> playlist -> number of occurences in it
+        self.contents: dict[Playlist, dict[str, int]] = {}  # the same by playlist (to forget a playlist without searching)
+        self.built = False
+
+    def build(self):
+        """starts following the playlists"""
+        with self.lock:
+            if self.built:
+                return
+            self.built = True
+            playlists.subscribe(self.playlists_changed)
+        self.playlists_changed(playlists, {"op": "reset"})
+
+    def playlists_of(self, song_id: str) -> list[Playlist]:
+        """all playlists containing the song"""
+        self.build()
+        with self.lock:
+            return list(self.refs.get(song_id, ()))
+
+    def songs(self) -> set[str]:
+        """all songs in any playlist"""
+        self.build()
+        with self.lock:
+            return set(self.refs)
+
+    def playlists_changed(self, pointer: Pointer, change: dict):
+        """follows added playlists and forgets removed ones"""
+        current = set(playlists.val.values())
+        with self.lock:
+            for playlist in [playlist for playlist in self.contents if playlist not in current]:
+                playlist.unsubscribe(self.playlist_changed)
+                self.forget(playlist)
+        for playlist in current:
+            self.watch(playlist)
+
+    def watch(self, playlist: Playlist):
+        """counts the songs of a playlist and follows its changes"""
+        with playlist.lock, self.lock:  # always the playlist first, as its changes arrive with its lock held
+            if playlist in self.contents:
+                return
+            playlist.subscribe(self.playlist_changed)
+            self.recount(playlist)
+
+    def playlist_changed(self, playlist: Playlist, change: dict):
+        with self.lock:
+            if playlist not in self.contents:  # not (or no longer) followed
+                return
+            match change:
+                case {"op": "append" | "insert", "value": song_id}:
+                    self.add(playlist, song_id, 1)
+                case {"op": "extend", "values": song_ids}:
+                    for song_id in song_ids:
+                        self.add(playlist, song_id, 1)
+                case {"op": "remove", "value": song_id}:
+                    self.add(playlist, song_id, -1)
+                case {"op": "set", "value": song_id, "old": old}:
+                    self.add(playlist, old, -1)
+                    self.add(playlist, song_id, 1)
+                case {"op": "move"}:
+                    pass
+                case _:
+                    self.recount(playlist)
+
+    def add(self, playlist: Playlist, song_id: str, n: int):
+        """changes the number of occurences of a song in a playlist by n"""
+        counts = self.contents[playlist]
+        refs = self.refs.setdefault(song_id, {})
+        count = counts.get(song_id, 0) + n
+        if count > 0:
+            counts[song_id] = refs[playlist] = count
+        else:
+            counts.pop(song_id, None)
+            refs.pop(playlist, None)
+            if not refs:
+                del self.refs[song_id]
+
+    def forget(self, playlist: Playlist):
+        """removes the songs of a playlist from the index"""
+        for song_id in self.contents.pop(playlist, {}):
+            refs = self.refs[song_id]
+            del refs[playlist]
+            if not refs:
+                del self.refs[song_id]
+
+    def recount(self, playlist: Playlist):
+        """counts the songs of a playlist again"""
+        songs = playlist.val  # first, as loading a lazy playlist reports a change of its own
+        self.forget(playlist)
+        self.contents[playlist] = {}
+        for song_id in songs:
+            self.add(playlist, song_id, 1)
+
+
+class Song:
+    """the metadata of a song. only holds what is actually used (instead of whole ytmusicapi results) to keep the db small"""
+    __slots__ = ("id", "title", "artists", "duration", "duration_seconds", "thumbnail")
+    fields = ("title", "artists", "duration", "duration_seconds", "thumbnail")  # what is stored in the db (the id is the key)
+
+    def __init__(self, song_id: str, title: str = "", artists: list[str] | None = None, duration: str = "", duration_seconds: int = 0, thumbnail: str = ""):
+        self.id = song_id  # eg. sdjgf234bn
+        self.title = title
+        self.artists: list[str] = artists or []
+        self.duration = duration  # eg. 3:24
+        self.duration_seconds = duration_seconds
+        self.thumbnail = thumbnail  # the url of a thumbnail
+
+    @property
+    def artist(self) -> str:
+        """the main artist"""
+        return self.artists[0] if self.artists else ""
+
+    @classmethod
+    def normalize(cls, info: dict, song_id: str | None = None) -> "Song":
+        """creates a Song from any song metadata: a yt.search() result, a yt.get_song() payload (or its videoDetails) or a stored song"""
+        info = info.get("videoDetails", info)
+        song_id = song_id or info["videoId"]
+        # search results have a list of {"name": ..., "id": ...} dicts, stored songs just the names and get_song() an author
+        artists = [artist["name"] if isinstance(artist, dict) else artist for artist in info.get("artists") or []]
+        if not artists and info.get("author"):
+            artists = [info["author"]]
+        seconds = int(info.get("duration_seconds") or info.get("lengthSeconds") or 0)
+        # search results have a list of thumbnails, get_song() a dict containing that list and stored songs a single url
+        thumbnail = info.get("thumbnail") or ""
+        if not isinstance(thumbnail, str):
+            thumbnail = thumbnail.get("thumbnails", [])
+        thumbnails = thumbnail if isinstance(thumbnail, list) else info.get("thumbnails") or []
+        if thumbnails:
+            thumbnail = thumbnails[-1]["url"]  # the last one is the biggest
+        return cls(song_id, info.get("title") or "", artists, info.get("duration") or format_time(seconds), seconds, thumbnail)
+
+    def to_dict(self) -> dict:
+        """the representation stored in the db"""
+        return {field: getattr(self, field) for field in self.fields}
+
+    @classmethod
+    def is_slim(cls, info: dict) -> bool:
+        """checks if stored metadata is already in the format of to_dict()"""
+        return info.keys() <= set(cls.fields) and all(isinstance(artist, str) for artist in info.get("artists", []))
 
 
 playlists = Pointer({})
 song_data = Pointer({})
 config = Pointer({})
+playlist_index = PlaylistIndex()  # which playlists contain a song
 
 
 def init():
     """loads files and config"""
     # global was never intended to be used this way... oh pythongod forgive my sins
-    global playlists, song_data, data, main_dir, config, song_dir, data_dir, playlist_dir, music_player, config_location, yt
+    global playlists, song_data, data, main_dir, config, song_dir, data_dir, download_dir, playlist_dir, music_player, config_location, yt, saver, downloads, thumbnails
     # the location where the os stores config (the $HOME/.config most likely)
     config_base = os.environ.get('APPDATA') or \
         os.environ.get('XDG_CONFIG_HOME') or \
         os.path.join(os.environ['HOME'], '.config')
     # the location of the config file
     config_location = Path(config_base).joinpath("Catvibes/config")
+    # the workdir to determine the location of the default config file
+    workdir = Path(__file__).parent
+    default_config_location = workdir.joinpath("config")
     # if the onfig file is nonexistent
     if not Path.is_file(config_location):
         # ensure that there are the required folders
         os.makedirs(config_location.parent, exist_ok=True)
-        # the workdir to determine the location of the default config file
-        workdir = Path(__file__).parent
-        default_config_location = workdir.joinpath("config")
         # and copy the default file to the location of the permanent config
         shutil.copy2(default_config_location, config_location.parent)
 
@@ -77,6 +499,11 @@ def init():
     data = Datamanager()
     # and load the config from the config file (json was not supposed to be used as a user editable config :()
     data.load(config_location, config)
+    # options added in newer versions are missing in older config files so they get the default values
+    with open(default_config_location, "r") as f:
+        for key, value in json.load(f).items():
+            if key not in config.val:
+                config.val[key] = value
     # retrieve the maindir ($HOME/Musik/Catvibes by default)
     main_dir = Path.home().joinpath(config.val["maindirectory"])
     # songs (the mp3 files) are stored in an /songs subdir
@@ -85,6 +512,9 @@ def init():
     # the songmetadata db (again in json) is stored in an /data subdir
     data_dir = main_dir.joinpath("data")
     os.makedirs(data_dir, exist_ok=True)
+    # songs are downloaded to a /downloads subdir before they are converted
+    download_dir = main_dir.joinpath("downloads")
+    os.makedirs(download_dir, exist_ok=True)
     # the playlists (json lists of strings) are stored in an /songs subdir
     playlist_dir = main_dir.joinpath("playlists")
     os.makedirs(playlist_dir, exist_ok=True)
@@ -98,7 +528,26 @@ def init():
     data.create_if_not_exsisting(logfile, "")
     logging.basicConfig(filename=str(logfile), filemode="w", encoding="utf-8", format="%(asctime)s: %(message)s", datefmt="%m/%d/%y %H:%M:%S", level=logging.INFO)
     # loads the song db
-    data.load(data_dir.joinpath("data"), song_data, {})
+    if config.val["storage"] == "sqlite":
+        db_file = data_dir.joinpath("songs.db")
+        new_db = not db_file.is_file()
+        song_data.val = SongDB(db_file)
+        data.add_db(song_data.val)  # changes are written by the Datamanager too
+        # the first time the sqlite db is used all songs of the json db are moved over
+        json_file = data_dir.joinpath("data")
+        if new_db and json_file.is_file():
+            song_data.val.import_json(json_file)
+            os.replace(json_file, data_dir.joinpath("data.json.bak"))  # keep the old db around but don't import it again
+            logging.info(f"migrated {len(song_data.val)} songs to {db_file}")
+        song_data.val.shrink()
+    else:
+        data.load(data_dir.joinpath("data"), song_data, {})
+        shrink = not all(Song.is_slim(info) for info in song_data.val.values())
+        song_data.val = {song_id: Song.normalize(info, song_id) for song_id, info in song_data.val.items()}
+        if shrink:  # old dbs contain the whole ytmusicapi results -> save them as Songs
+            logging.info("shrinking song db")
+        else:
+            data.mark_saved(song_data)
 
     # fix for pyinstaller & python-vlc
     if sys.platform.startswith("linux"):
@@ -111,65 +560,257 @@ def init():
     # loads all playlists
     with os.scandir(playlist_dir) as files:
         for f in files:
+            if f.name.startswith("."):  # skips leftovers of interrupted saves
+                continue
             name = Path(f).stem
-            logging.info(f"loaded playlist {name}")
-            temp = Pointer([])
-            data.load(Path(f), temp)
+            logging.info(f"found playlist {name}")
+            temp = Playlist()
+            data.load(Path(f), temp, lazy=True)  # the songs are only read once the playlist is used
             playlists.val[name] = temp
+    # songs rendered with the templates of the config are cached until the song or the template changes
+    song_data.subscribe(forget_songs)
+    config.subscribe(forget_templates)
+    # thumbnails shown in search results are kept on disk
+    thumbnails = ThumbnailCache(data_dir.joinpath("thumbnails"))
+    # saves changes in the background from now on
+    saver = Saver(data, config.val["save_interval"])
+    # the UIs download songs in the background
+    downloads = DownloadManager(config.val["download_workers"])
     # creates a musicplayer
     music_player = MusicPlayer()
-    # and a YouTube interface
-    yt = YTInterface()
+    # and a YouTube interface with a cache for its results
+    cache = Cache(config.val["cache_size"], config.val["cache_ttl"], data_dir.joinpath("cache.db") if config.val["disk_cache"] else None)
+    data.add_db(cache)  # new entries are written by the Saver
+    yt = YTInterface(cache)
+
+
+class Cache:
+    """a threadsafe LRU cache whose entries are fresh for ttl seconds. hits and misses are counted.
+    with a file the entries are also stored in sqlite (written on flush() like the SongDB) so they survive restarts"""
+    max_age = 30 * 24 * 3600  # entries in the file are deleted after 30 days
+
+    def __init__(self, size: int, ttl: float, file: Path | None = None):
+        self.size = size
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()  # key -> (time stored, value), the last one was used most recently
+        self.pending: dict[str, tuple[float, Any]] = {}  # entries not yet written to the file
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+        self.connection: sqlite3.Connection | None = None
+        if file is not None:
+            self.connection = sqlite3.connect(file, check_same_thread=False, isolation_level=None)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, time REAL, value TEXT NOT NULL)")
+            self.connection.execute("DELETE FROM cache WHERE time < ?", (time.time() - self.max_age,))
+
+    def get(self, key: str, stale: bool = False) -> tuple[bool, Any]:
+        """returns (found, value) for a key. stale entries are only returned if stale is True (eg. when offline)"""
+        with self.lock:
+            entry = self.entries.get(key) or self.pending.get(key)
+            if entry is None and self.connection is not None:
+                row = self.connection.execute("SELECT time, value FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+            if entry is not None and (stale or time.time() - entry[0] < self.ttl):
+                self.hits += 1
+                self.remember(key, entry)
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, value: Any):
+        """stores a value"""
+        with self.lock:
+            entry = (time.time(), value)
+            self.remember(key, entry)
+            if self.connection is None:
+                return
+            self.pending[key] = entry
+        if saver is not None:
+            saver.request()  # written with the next save like the changes of the Pointers
+
+    def remember(self, key: str, entry: tuple[float, Any]):
+        """keeps an entry in memory and forgets the least recently used ones if there are too many"""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def flush(self):
+        """writes the new entries to the file"""
+        with self.lock:
+            if self.connection is None or not self.pending:
+                return
+            pending, self.pending = self.pending, {}
+            try:
+                self.connection.execute("BEGIN")
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                    ((key, stored, json.dumps(value)) for key, (stored, value) in pending.items())
+                )
+                self.connection.execute("COMMIT")
+            except Exception:
+                # nothing was written -> the entries stay pending for the next flush (newer ones win)
+                if self.connection.in_transaction:
+                    self.connection.execute("ROLLBACK")
+                self.pending = pending | self.pending
+                raise
+
+    def stats(self) -> str:
+        """a short summary of the hits and misses"""
+        total = self.hits + self.misses
+        return f"{self.hits} hits, {self.misses} misses ({self.hits / total * 100 if total else 0:.0f}% hits)"
+
+
+class ThumbnailCache:
+    """downloads thumbnails with a shared http session in a few threads and keeps them in a directory.
+    the files are named by the hash of their content (identical thumbnails are stored once) and an index maps urls to them"""
+
+    def __init__(self, directory: Path, workers: int = 8):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.index = Pointer({})  # url -> content hash
+        data.load(directory.joinpath("index"), self.index, {})
+        self.session = requests.Session()  # reuses connections
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=workers))
+        self.pool = ThreadPoolExecutor(workers, "thumbnail")
+
+    def get(self, url: str) -> bytes:
+        """returns the content of a thumbnail (downloads it if it is not cached)"""
+        digest = self.index.val.get(url)
+        if digest is not None:
+            try:
+                return self.directory.joinpath(digest).read_bytes()
+            except FileNotFoundError:
+                pass
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        file = self.directory.joinpath(digest)
+        if not file.is_file():
+            temp = self.directory.joinpath(f".{digest}")
+            temp.write_bytes(content)
+            os.replace(temp, file)
+        self.index.val[url] = digest
+        return content
+
+    def fetch(self, url: str) -> Future:
+        """gets a thumbnail in the background. the result of the future is its content"""
+        return self.pool.submit(self.get, url)
 
 
 class YTInterface:
-    """a basic wrapper class around YTMusicapi mainly to prevent errors if no internet connection is available"""
+    """a basic wrapper class around YTMusicapi mainly to prevent errors if no internet connection is available.
+    the connectivity is checked in the background and rechecked with a growing delay while offline"""
+    min_retry_delay = 5  # seconds until the connectivity is checked again after going offline
+    max_retry_delay = 300
+
+    def __init__(self, cache: Cache | None = None):
+        self._yt: ytmusicapi.YTMusic | None = None  # created when first needed
+        self.cache = cache or Cache(0, 0)  # remembers results of previous calls
+        self.lock = threading.Lock()
+        self.state: bool | None = None  # the last known connectivity, None while the first check is running
+        self.checking = False
+        self.retry_delay: float = self.min_retry_delay
+        self.next_check: float = 0  # when to check again while offline
+        self.check_in_background()
 
-    def __init__(self):
-        self.yt = ytmusicapi.YTMusic()
-        self.connect()
+    @property
+    def yt(self) -> ytmusicapi.YTMusic:
+        """the actual ytmusicapi object"""
+        with self.lock:
+            if self._yt is None:
+                self._yt = ytmusicapi.YTMusic()
+            return self._yt
+
+    @property
+    def online(self) -> bool:
+        """the last known connectivity (assumed online until a check fails). never blocks but starts a new check if it is due"""
+        if self.state is False and time.monotonic() >= self.next_check:
+            self.check_in_background()
+        return self.state is not False
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """calls a ytmusicapi function and updates the connectivity depending on the outcome"""
+        if not self.online:
+            raise self.offline_error
+        try:
+            result = func(*args, **kwargs)
+        except OSError as e:  # connection problems (requests exceptions are OSErrors too)
+            self.went_offline()
+            raise self.offline_error from e
+        self.went_online()
+        return result
+
+    def cached_call(self, name: str, *args, **kwargs) -> Any:
+        """calls the ytmusicapi function name or returns the cached result of an identical call.
+        if the call fails (eg. offline) an outdated result is used too"""
+        key = json.dumps([name, args, kwargs], sort_keys=True)
+        found, result = self.cache.get(key)
+        if found:
+            return result
+        try:
+            result = self.call(getattr(self.yt, name), *args, **kwargs)
+        except Exception:
+            found, result = self.cache.get(key, stale=True)
+            if found:
+                return result
+            raise
+        self.cache.put(key, result)
+        return result
 
     def search(self, *args, **kwargs) -> list[dict]:
         """returns dictionaries containing info about songs matching the first argument
             second argument: filter, str "videos" searches YT or "songs" searches YTMusic
         """
-        if self.online:
-            return self.yt.search(*args, **kwargs)
-        else:
-            raise self.offline_error
+        return self.cached_call("search", *args, **kwargs)
 
     def get_search_suggestions(self, *args, **kwargs) -> list[str]:
         """returns possible search completions"""
-        if self.online:
-            return self.yt.get_search_suggestions(*args, **kwargs) # type: ignore
-        else:
-            raise self.offline_error
+        return self.cached_call("get_search_suggestions", *args, **kwargs)
 
     def get_song(self, song_id: str) -> dict:
         """returns metadata about a specific song"""
-        if self.online:
-            return self.yt.get_song(song_id)
-        else:
-            raise self.offline_error
-    
+        return self.cached_call("get_song", song_id)
+
     def get_song_related(self, song_id: str) -> list[dict[str, Any]]:
         """returns suggestions for next songs after a provided song"""
-        if self.online:
-            return self.yt.get_song_related(song_id)
-        else:
-            raise self.offline_error
+        return self.cached_call("get_song_related", song_id)
+
+    def check_in_background(self):
+        """checks the connectivity in a background thread (unless a check is already running)"""
+        with self.lock:
+            if self.checking:
+                return
+            self.checking = True
+        threading.Thread(target=self.connect, name="connectivity check", daemon=True).start()
 
     def connect(self):
         """checks connectivity"""
-        self.online = True
         try:
-            self.yt.search("test")
-        except:
-            self.online = False
+            self.yt.get_search_suggestions("test")  # a small request
+        except Exception:
+            self.went_offline()
+        else:
+            self.went_online()
+        finally:
+            self.checking = False
+
+    def went_online(self):
+        self.state = True
+        self.retry_delay = self.min_retry_delay
+
+    def went_offline(self):
+        """remembers being offline and when to check again (each failed check doubles the delay)"""
+        if self.state is not False:
+            logging.info("went offline")
+        self.state = False
+        self.next_check = time.monotonic() + self.retry_delay
+        self.retry_delay = min(self.retry_delay * 2, self.max_retry_delay)
 
     @property
     def offline_error(self) -> Exception:
-        self.connect()
         return Exception("you are offline")
 
 
@@ -182,6 +823,7 @@ class DisplayTab:
         self.keyhandler: dict[str, Callable] = {}  # a map of key -> function
         self.line: int = linestart  # the preselected line
         self.maxy, self.maxx = self.screen.getmaxyx()  # the dimensions of the screen
+        self.shown: Any = None  # the version of the data the tab was last drawn with
         self.on_key("KEY_UP", self.up)
         self.on_key("KEY_DOWN", self.down)
 
@@ -209,17 +851,27 @@ class DisplayTab:
         if key in self.keyhandler:
             self.keyhandler[key]()
 
+    @property
+    def version(self) -> Any:
+        """changes whenever the data shown by the tab changes"""
+        ...
+
     def disp(self):
         """draws the tab"""
         ...
 
+    def update(self):
+        """draws the tab again if its data changed since it was last drawn"""
+        if self.version != self.shown:
+            self.disp()
+
 
 class PlaylistTab(DisplayTab):
     """a tab for simply interacting with playlists"""
 
-    def __init__(self, window, title: str, playlist: Pointer, linestart: int = 0):
+    def __init__(self, window, title: str, playlist: Playlist, linestart: int = 0):
         super().__init__(window, title, linestart=linestart)
-        self.playlist = playlist  # a pointer of an list[str]
+        self.playlist = playlist  # a list[str] of song ids
         self.on_key("f", self.add_song)
         self.on_key("p", self.play_playlist)
         self.on_key("a", self.add_song_to_queue)
@@ -233,18 +885,20 @@ class PlaylistTab(DisplayTab):
     def maxlines(self):
         return len(self.playlist.val)
 
+    @property
+    def version(self) -> tuple[int, int]:
+        return self.playlist.version, song_data.version
+
     def disp(self):
         """displays the playlist on the screen"""
+        self.shown = self.version
         # which song to display at the top
         start = 0
         # which song to display at the bottom
         end = 0
 
-        playlist_view = []
         # adjusts the dimensions to account for possible resizes
         self.maxy, self.maxx = self.screen.getmaxyx()
-        # clears the screen
-        self.screen.clear()
         if self.maxy > len(self.playlist.val):  # is the window big enough for all songs
             start = 0
             end = len(self.playlist.val)  # the just display all songs
@@ -264,47 +918,46 @@ class PlaylistTab(DisplayTab):
         # the resulting slice of the playlist
         playlist_view = self.playlist.val[start:end]
         # display the slice
+        lines = {}
         for i, song in enumerate(playlist_view):
             try:
-                if i == self.line - start:  # the current line is displayed with a reverse filter
-                    addstr(self.screen, i, 0, song_string(song_data.val[song]), curses.A_REVERSE)
-                else:  # all other lines not
-                    addstr(self.screen, i, 0, song_string(song_data.val[song]))
+                # the current line is displayed with a reverse filter
+                lines[i] = ((render_id("songstring", song), curses.A_REVERSE if i == self.line - start else curses.A_NORMAL),)
             except KeyError:  # display a warning if a song is not found
                 info(self.screen, f"a song with id {song} was not found. ")
-                self.playlist.val.remove(song)
-        # actually draws on the screen
-        self.screen.refresh()
+                self.playlist.remove_at(self.playlist.val.index(song))
+        # only changed lines are drawn (and shown with the next curses.doupdate())
+        Frame.of(self.screen).draw(lines)
 
     def add_song(self):
         """ searches for a song and adds it to the playlist"""
-        # gets a song_data dict for a userinput or None if aborted
-        result: dict[str, Any] | None = search(self.screen)
+        # gets a Song for a userinput or None if aborted
+        result: Song | None = search(self.screen)
         if result is not None:
-            # if the song finished downloading add the song to the playlist and display the tab again
-            def finished():
-                self.playlist.val.append(result["videoId"])
-                self.line = len(self.playlist.val) - 1
-                self.disp()
-            # download the song
-            download_song(result, on_finished=finished)
+            # if the song finished downloading add the song to the playlist (the UI displays the tab again)
+            def finished(download: Download):
+                if download.state == "done":
+                    self.playlist.append(result.id)
+                    self.line = len(self.playlist.val) - 1
+                elif download.state == "failed":
+                    info(self.screen, f"could not download {result.title}. ")
+            # download the song in the background
+            downloads.submit(result, callback=finished)
 
     def remove_song(self):
         """removes the selected song from the playlist"""
-        del self.playlist.val[self.line]
+        self.playlist.remove_at(self.line)
         if self.maxlines > 0:
             self.line = self.line % self.maxlines
 
     def play_playlist(self):
         """plays this playlist from the current line  till the end"""
         music_player.clear_list()
-        music_player.add_list(
-            [song_file(self.playlist.val[i]) for i in range(self.line, self.maxlines)]
-        )
+        music_player.add_list(self.playlist.val[self.line:self.maxlines])
 
     def add_song_to_queue(self):
         """appends the selected song to the queue"""
-        music_player.add(song_file(self.playlist.val[self.line]))
+        music_player.add(self.playlist.val[self.line])
 
     def shuffle(self):
         """plays the playlist from current line in shuffeled order"""
@@ -332,72 +985,418 @@ class PlaylistTab(DisplayTab):
         name: str | None = inputstr(self.screen, "Name of the playlist: ")
         if name is not None:
             # creates a new playlist
-            temp = Pointer([])
+            temp = Playlist()
             data.load(playlist_dir.joinpath(name), temp, default=[])
-            playlists.val[name] = temp.val
+            playlists.val[name] = temp
 
 
 class SongsTab(PlaylistTab):
     """a tab for all songs"""
 
     def __init__(self, screen):
-        super().__init__(screen, "Songs", Pointer([]))
+        super().__init__(screen, "Songs", Playlist(journaled=False))  # shown but never saved
+        self.filter = ""  # only songs whose title or artist starts with it are shown
+        self.songs_version = song_data.version  # the version of the db the list of songs was taken from
         self.playlist.val = list(song_data.val.keys())  # the songsoverview works by using all known songs in a list
         self.on_key("d", self.del_song_from_db)  # but removing a song deletes the song completely
-        del self.keyhandler["f"]  # finding a song is not supported here
+        self.on_key("f", self.find)  # and finding filters the known songs instead of searching for new ones
+
+    def find(self):
+        """shows only the songs whose title or artist starts with the entered text (nothing shows all songs again)"""
+        text = inputstr(self.screen, "Title or artist: ")
+        if text is None:
+            return
+        self.filter = text
+        self.title = f"Songs ({text})" if text else "Songs"
+        self.songs_version = None  # the songs are taken again with the next disp()
+        self.line = 0
 
     def del_song_from_db(self):
         """deletes a song from everything"""
         song_id = self.playlist.val[self.line]
-        # first the metadata about the song is removed alongside
-        try:
-            del song_data.val[song_id]
-        except IndexError:
+        if song_id not in song_data.val:
             info(self.screen, f"Cannot delete that Song {song_id}. ")
             return
-        # then the song is removed from all playlists
-        for playlist in playlists.val.values():
-            while song_id in playlist:
-                playlist.remove(song_id)
+        # the metadata is removed alongside every occurence in the playlists
+        delete_songs([song_id])
         self.disp()
 
     def disp(self):
-        self.playlist.val = list(song_data.val.keys())
+        if self.songs_version != song_data.version:  # the list of all songs is only taken again if the db changed
+            self.songs_version = song_data.version
+            self.playlist.val = find_songs(self.filter) if self.filter else list(song_data.val.keys())
         super().disp()
 
 
+class SongDB(Observable):
+    """song metadata stored in a sqlite file. used instead of the song_data dict if config["storage"] is "sqlite"
+    supports the same access as a dict (lookup by id, iterating ids, deleting).
+    changes are kept in memory until flush() writes them (usually by the Saver) as single rows.
+    modifications are reported to the Pointer holding it like those of an ObservableDict"""
+
+    def __init__(self, file: Path):
+        # the db is used by the download and saver threads too so access is guarded by a lock
+        self.connection = sqlite3.connect(file, check_same_thread=False, isolation_level=None)
+        self.lock = threading.RLock()
+        self.pending: dict[str, Song | None] = {}  # unwritten changes, None marks a deleted song
+        self.execute("PRAGMA journal_mode=WAL")
+        # title and artist are stored seperately (and indexed) so they can be queried without decoding the info
+        self.execute("CREATE TABLE IF NOT EXISTS songs (id TEXT PRIMARY KEY, title TEXT, artist TEXT, info TEXT NOT NULL)")
+        self.execute("CREATE INDEX IF NOT EXISTS songs_title ON songs (title COLLATE NOCASE)")
+        self.execute("CREATE INDEX IF NOT EXISTS songs_artist ON songs (artist COLLATE NOCASE)")
+
+    def execute(self, sql: str, params: Iterable = ()) -> list[tuple]:
+        """runs a sql statement and returns all resulting rows"""
+        with self.lock:
+            return self.connection.execute(sql, tuple(params)).fetchall()
+
+    @staticmethod
+    def row(song_id: str, song: Song) -> tuple[str, str, str, str]:
+        """the row representing a song"""
+        return song_id, song.title, song.artist, json.dumps(song.to_dict())
+
+    def shrink(self):
+        """converts songs stored by older versions (as whole ytmusicapi results) to the format of Song.to_dict()"""
+        with self.lock:
+            version = self.execute("PRAGMA user_version")[0][0]
+            if version >= 1:  # already done
+                return
+            self.pending.update(
+                (song_id, Song.normalize(json.loads(info), song_id)) for song_id, info in self.execute("SELECT id, info FROM songs")
+            )
+            self.flush()
+            self.execute("PRAGMA user_version = 1")
+
+    def flush(self):
+        """writes all pending changes in one transaction"""
+        with self.lock:
+            if not self.pending:
+                return
+            pending, self.pending = self.pending, {}
+            try:
+                self.connection.execute("BEGIN")
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO songs VALUES (?, ?, ?, ?)",
+                    (self.row(k, v) for k, v in pending.items() if v is not None)
+                )
+                self.connection.executemany("DELETE FROM songs WHERE id = ?", ((k,) for k, v in pending.items() if v is None))
+                self.connection.execute("COMMIT")
+            except Exception:
+                # nothing was written -> the changes stay pending for the next flush (newer ones win)
+                if self.connection.in_transaction:
+                    self.connection.execute("ROLLBACK")
+                self.pending = pending | self.pending
+                raise
+
+    def __getitem__(self, song_id: str) -> Song:
+        with self.lock:
+            if song_id in self.pending:
+                song = self.pending[song_id]
+                if song is None:
+                    raise KeyError(song_id)
+                return song
+            rows = self.execute("SELECT info FROM songs WHERE id = ?", (song_id,))
+        if not rows:
+            raise KeyError(song_id)
+        return Song.normalize(json.loads(rows[0][0]), song_id)
+
+    def __setitem__(self, song_id: str, song: Song):
+        with self.lock:
+            self.pending[song_id] = song
+        self.notify({"op": "set", "key": song_id, "value": song})
+
+    def __delitem__(self, song_id: str):
+        with self.lock:
+            if song_id not in self:
+                raise KeyError(song_id)
+            self.pending[song_id] = None
+        self.notify({"op": "del", "key": song_id})
+
+    def delete(self, song_ids: Iterable[str]):
+        """deletes many songs (skipping unknown ones) as a single change"""
+        with self.lock:
+            deleted = [song_id for song_id in dict.fromkeys(song_ids) if song_id in self]
+            self.pending.update((song_id, None) for song_id in deleted)
+        self.notify_deleted(deleted)
+
+    def __contains__(self, song_id) -> bool:
+        with self.lock:
+            if song_id in self.pending:
+                return self.pending[song_id] is not None
+            return bool(self.execute("SELECT 1 FROM songs WHERE id = ?", (song_id,)))
+
+    def __len__(self) -> int:
+        with self.lock:
+            if not self.pending:
+                return self.execute("SELECT COUNT(*) FROM songs")[0][0]
+            return len(self.keys())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self) -> list[str]:
+        """all song ids in the order they were added"""
+        with self.lock:
+            ids = [row[0] for row in self.execute("SELECT id FROM songs ORDER BY rowid")]
+            if self.pending:
+                known = set(ids)
+                ids = [song_id for song_id in ids if self.pending.get(song_id, True) is not None]
+                ids.extend(k for k, v in self.pending.items() if v is not None and k not in known)
+        return ids
+
+    def values(self) -> list[Song]:
+        return [song for _, song in self.items()]
+
+    def items(self) -> list[tuple[str, Song]]:
+        # the pending changes are laid over the stored songs instead of being flushed (which is left to the Saver)
+        with self.lock:
+            rows = self.execute("SELECT id, info FROM songs ORDER BY rowid")
+            pending = dict(self.pending)
+        items = [
+            (song_id, pending[song_id] if song_id in pending else Song.normalize(json.loads(info), song_id))  # type: ignore
+            for song_id, info in rows if pending.get(song_id, True) is not None
+        ]
+        known = {song_id for song_id, _ in rows}
+        items.extend((k, v) for k, v in pending.items() if v is not None and k not in known)
+        return items
+
+    def get(self, song_id: str, default=None):
+        try:
+            return self[song_id]
+        except KeyError:
+            return default
+
+    def find(self, text: str) -> list[str]:
+        """returns the ids of all songs whose title or artist starts with text (case insensitive)"""
+        pattern = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self.lock:
+            rows = self.execute(
+                "SELECT id FROM songs WHERE title LIKE ? ESCAPE '\\' OR artist LIKE ? ESCAPE '\\' ORDER BY rowid", (pattern, pattern)
+            )
+            pending = dict(self.pending)
+        # pending songs are matched in memory (deleted or changed ones may not match anymore, new ones may)
+        prefix = text.casefold()
+        ids = [row[0] for row in rows if row[0] not in pending or (pending[row[0]] is not None and starts_with(pending[row[0]], prefix))]
+        found = set(ids)
+        ids.extend(k for k, v in pending.items() if v is not None and k not in found and starts_with(v, prefix))
+        return ids
+
+    def ids_not_in(self, song_ids: Iterable[str]) -> list[str]:
+        """returns the ids of all songs in the db that are not in song_ids"""
+        with self.lock:
+            self.flush()
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS keep (id TEXT PRIMARY KEY)")
+            self.connection.execute("DELETE FROM keep")
+            self.connection.executemany("INSERT OR IGNORE INTO keep VALUES (?)", ((song_id,) for song_id in song_ids))
+            rows = self.connection.execute("SELECT id FROM songs WHERE id NOT IN (SELECT id FROM keep) ORDER BY rowid").fetchall()
+        return [row[0] for row in rows]
+
+    def import_json(self, file: Path):
+        """adds all songs of a json song db (the format used with config["storage"] == "json") in one transaction"""
+        with open(file, "r") as f:
+            songs: dict[str, dict] = json.load(f)
+        with self.lock:
+            self.pending.update((song_id, Song.normalize(info, song_id)) for song_id, info in songs.items())
+            self.flush()
+        self.notify({"op": "reset"})
+
+    def export_json(self, file: Path):
+        """writes all songs to a json song db that can be used with config["storage"] == "json" """
+        Datamanager.save(Pointer(dict(self.items())), file)
+
+
+def songs_not_in(song_ids: Iterable[str]) -> list[str]:
+    """returns all songs in the db that are not in song_ids"""
+    if isinstance(song_data.val, SongDB):
+        return song_data.val.ids_not_in(song_ids)  # lets sqlite do the work
+    keep = set(song_ids)
+    return [song for song in song_data.val.keys() if song not in keep]
+
+
+def find_songs(text: str) -> list[str]:
+    """returns all songs whose title or artist starts with text (case insensitive)"""
+    if isinstance(song_data.val, SongDB):
+        return song_data.val.find(text)  # uses the indexes on title and artist
+    prefix = text.casefold()
+    return [song_id for song_id, song in song_data.val.items() if starts_with(song, prefix)]
+
+
+def starts_with(song: Song, prefix: str) -> bool:
+    """whether the title or artist of a song starts with a (casefolded) prefix"""
+    return song.title.casefold().startswith(prefix) or song.artist.casefold().startswith(prefix)
+
+
+def remove_from_playlists(song_ids: Iterable[str]):
+    """removes every occurence of the songs from all playlists, touching only the playlists containing them"""
+    song_ids = set(song_ids)
+    affected = {playlist for song_id in song_ids for playlist in playlist_index.playlists_of(song_id)}
+    for playlist in affected:
+        playlist.remove_songs(song_ids)
+
+
+def delete_songs(song_ids: Iterable[str]):
+    """deletes songs from the db and all playlists"""
+    song_ids = set(song_ids)
+    remove_from_playlists(song_ids)
+    song_data.val.delete(song_ids)
+
+
 class Datamanager:
     """a class for saving and loading variables to files"""
 
     def __init__(self):
-        # files[i] and vars[i] belong together
+        # files[i], vars[i] and saved[i] belong together
         self.files: list[Path] = []
         self.vars: list[Pointer] = []
+        self.saved: list[int] = []  # the version of each variable when it was last written to its file
+        self.dbs: list[SongDB | Cache] = []  # dbs that write their changes on their own but only when told so
+        self.lock = threading.RLock()  # only one thread may save at a time
 
-    def load(self, file: Path, to: Pointer, default: Any = {}):
-        """loads and links a file to a variable. if the file is nonexistent load default and create file"""
+    def load(self, file: Path, to: Pointer, default: Any = {}, lazy: bool = False):
+        """loads and links a file to a variable. if the file is nonexistent load default and create file.
+        lazy playlists are only read when their value is accessed the first time"""
         self.create_if_not_exsisting(file, default)
-        # saves the content of the file in the Pointer
-        with open(file, "r") as loaded_file:
-            to.val = json.load(loaded_file)
         # remembers the Pointer-file association for later saving purposes
         self.vars.append(to)
         self.files.append(file)
+        self.saved.append(to.version)
+        if lazy and isinstance(to, Playlist):
+            to.loader = partial(self.read, len(self.files) - 1)
+        else:
+            self.read(len(self.files) - 1)
+
+    def mark_saved(self, var: Pointer):
+        """tells the Datamanager that the file of a variable is up to date"""
+        with self.lock:  # waits for a running save
+            self.saved[self.vars.index(var)] = var.version
+
+    def read(self, i: int):
+        """reads the i-th file to its variable"""
+        file, to = self.files[i], self.vars[i]
+        # saves the content of the file in the Pointer
+        with open(file, "r") as loaded_file:
+            to.val = json.load(loaded_file)
+        if isinstance(to, Playlist):
+            self.replay_journal(to, file)
+        self.saved[i] = to.version  # the file matches the variable right now
 
     @staticmethod
-    def save(var: Pointer, file=Path):
+    def save(var: Pointer, file: Path):
         """saves a variable to a file"""
-        if var.val is not None:
-            with open(file, "w") as f: # type: ignore
-                f.write(json.dumps(var.val, indent=4))
-
-    def save_all(self):
-        """saves all var:file associations"""
-        for i in range(len(self.files)):
-            var_pointer: Pointer = self.vars[i]
-            file: Path = self.files[i]
-            self.save(var_pointer, file) # type: ignore
-        logging.info("saved all files")
+        val = copy.copy(var.val)  # a shallow copy is taken at once, so other threads can keep modifying the variable while it is written
+        if val is not None:
+            content = json.dumps(val, indent=4, default=Datamanager.encode)
+            # writes to a temporary file first and then replaces the old file so a crash can't leave a half written file behind
+            temp = file.with_name(f".{file.name}.tmp")
+            with open(temp, "w") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, file)
+
+    @staticmethod
+    def encode(obj) -> Any:
+        """converts objects json doesn't know (like Songs) to something it knows"""
+        if isinstance(obj, Song):
+            return obj.to_dict()
+        raise TypeError(f"cannot save {type(obj)}")
+
+    # a playlist is stored as a snapshot file (a plain json list) and a journal of changes made since the snapshot was written.
+    # the first line of the journal is the checksum of the snapshot it belongs to, so a journal is ignored if the snapshot
+    # was rewritten (compacted) but the program stopped before the journal could be deleted
+    journal_limit = 500  # the number of journal entries after which the playlist is compacted into the snapshot
+
+    @staticmethod
+    def journal_file(file: Path) -> Path:
+        """the location of the journal of a playlist file (hidden next to it)"""
+        return file.with_name(f".{file.name}.journal")
+
+    @staticmethod
+    def checksum(songs: list[str]) -> int:
+        """a checksum of a playlist to identify a snapshot"""
+        return zlib.crc32(json.dumps(songs).encode())
+
+    def replay_journal(self, playlist: Playlist, file: Path):
+        """applies the journal of a playlist file to the freshly loaded playlist"""
+        playlist.base = self.checksum(playlist.val)  # the checksum of the snapshot on disk
+        playlist.journal_length = 0
+        journal = self.journal_file(file)
+        torn = False
+        if journal.is_file():
+            with open(journal, "r") as f:
+                lines = f.read().splitlines()
+            if lines and lines[0] == str(playlist.base):
+                for line in lines[1:]:
+                    try:
+                        Playlist.apply(playlist.val, json.loads(line))
+                    except (ValueError, KeyError, IndexError):  # most likely the last entry was not written completely
+                        logging.warning(f"stopped replaying {journal} at {line}")
+                        torn = True
+                        break
+                    playlist.journal_length += 1
+            else:  # the journal belongs to an older snapshot
+                journal.unlink()
+            logging.info(f"replayed {playlist.journal_length} changes of {file}")
+        # the loaded playlist is identical to the files
+        playlist.journal = []
+        # unless the journal ends in a broken entry, new entries appended to it would never be replayed -> compact on the next save
+        playlist.rewrite = torn
+
+    def save_playlist(self, playlist: Playlist, file: Path, compact: bool = False):
+        """appends the unsaved changes of a playlist to its journal or rewrites (compacts) it if the journal grew too long"""
+        with playlist.lock:
+            entries, playlist.journal = playlist.journal, []
+            compact = compact or playlist.rewrite or playlist.journal_length + len(entries) > self.journal_limit
+            playlist.rewrite = False
+            songs = list(playlist.val)
+        journal = self.journal_file(file)
+        try:
+            if compact:
+                self.save(Pointer(songs), file)
+                playlist.base = self.checksum(songs)
+                playlist.journal_length = 0
+                journal.unlink(missing_ok=True)
+            elif entries:
+                # a new journal starts with the checksum of the snapshot
+                with open(journal, "w" if playlist.journal_length == 0 else "a") as f:
+                    if playlist.journal_length == 0:
+                        f.write(f"{playlist.base}\n")
+                    f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+                    f.flush()
+                    os.fsync(f.fileno())
+                playlist.journal_length += len(entries)
+        except Exception:
+            # the changes are still unsaved. as part of them may have reached the journal it is rewritten the next time
+            with playlist.lock:
+                playlist.journal = entries + playlist.journal
+                playlist.rewrite = True
+            raise
+
+    def add_db(self, db: SongDB | Cache):
+        """lets the Datamanager flush a db whenever it saves"""
+        self.dbs.append(db)
+
+    def save_all(self, force: bool = False):
+        """saves all var:file associations that changed since the last save (or all of them if forced)"""
+        with self.lock:
+            written = 0
+            for i in range(len(self.files)):
+                var_pointer: Pointer = self.vars[i]
+                file: Path = self.files[i]
+                version = var_pointer.version  # remember the version before saving as the variable could change while saving
+                if isinstance(var_pointer, Playlist) and not var_pointer.loaded:
+                    continue  # nothing to save if it was never even loaded
+                if isinstance(var_pointer, Playlist) and (force or version != self.saved[i]):
+                    self.save_playlist(var_pointer, file, compact=force)
+                    self.saved[i] = version
+                    written += 1
+                elif force or version != self.saved[i]:
+                    self.save(var_pointer, file)
+                    self.saved[i] = version
+                    written += 1
+            for db in self.dbs:
+                db.flush()
+        logging.info(f"saved {written} of {len(self.files)} files")
 
     @staticmethod
     def create_if_not_exsisting(file:Path, content):
@@ -409,25 +1408,249 @@ class Datamanager:
                 f.write(json.dumps(content))
 
 
+class Saver:
+    """saves the Datamanager in a background thread. request() marks something as unsaved,
+    all requests within interval seconds are saved together"""
+
+    def __init__(self, datamanager: Datamanager, interval: float):
+        self.data = datamanager
+        self.interval = interval
+        self.requested = threading.Event()  # set if there are unsaved changes
+        self.stopped = threading.Event()  # set if the thread should end
+        self.thread = threading.Thread(target=self.run, name="saver", daemon=True)
+        self.thread.start()
+
+    def request(self):
+        """marks data as unsaved. does no file I/O so it can be called from any thread"""
+        self.requested.set()
+
+    def run(self):
+        """waits for requests and saves everything changed in the following interval at once"""
+        while not self.stopped.is_set():
+            self.requested.wait()
+            # gives other changes time to pile up (unless the saver is stopped in the meantime)
+            self.stopped.wait(self.interval)
+            if self.stopped.is_set():
+                return
+            self.requested.clear()
+            try:
+                self.data.save_all()
+            except Exception as e:  # eg. a locked db, the thread has to survive it
+                logging.exception(f"could not save: {e}")
+                self.requested.set()  # tries again after the next interval
+
+    def flush(self):
+        """stops the thread and saves everything right away (used when exiting)"""
+        self.stopped.set()
+        self.requested.set()  # wakes up the thread so it can end
+        self.thread.join()
+        self.data.save_all()
+
+
+class PlayQueue:
+    """the songs (ids) played by the MusicPlayer. songs are enqueued in bulk and their counts kept in a dict for quick membership tests.
+    a shuffled order is only drawn as far as it is played: a fisher-yates shuffle that remembers swapped positions in a dict instead of permuting the list.
+    songs to be played next wait in a deque in front of the order and played songs are remembered for going back"""
+
+    def __init__(self):
+        self.songs: list[str] = []  # the enqueued songs
+        self.counts: dict[str, int] = {}  # how often each song is enqueued
+        self.upnext: deque[str] = deque()  # songs played before continuing with the order
+        self.history: deque[str] = deque(maxlen=1000)  # the previously played songs (the most recent last)
+        self.position: int = -1  # the position of the current song in the order
+        self.current: str | None = None  # the song that is played
+        self.shuffled: bool = False
+        self.swaps: dict[int, int] = {}  # position -> index of the song drawn for it (only for positions that were swapped)
+        self.drawn: int = 0  # the number of positions of the shuffled order that are decided
+        self.source: Any = None  # what the songs were enqueued from (UIs use it to recognise their own queue)
+
+    def __len__(self) -> int:
+        return len(self.songs) + len(self.upnext)
+
+    def __contains__(self, song_id: str) -> bool:
+        return song_id in self.counts
+
+    def count(self, song_ids: Iterable[str], change: int):
+        """changes the counts of songs"""
+        for song_id in song_ids:
+            count = self.counts.get(song_id, 0) + change
+            if count > 0:
+                self.counts[song_id] = count
+            else:
+                self.counts.pop(song_id, None)
+
+    def extend(self, song_ids: Iterable[str]):
+        """enqueues songs at the end (while shuffled they are mixed into the songs that were not drawn yet)"""
+        start = len(self.songs)
+        self.songs.extend(song_ids)
+        self.count(self.songs[start:], 1)
+
+    def play_next(self, song_id: str):
+        """enqueues a song to be played right after the current one"""
+        self.upnext.appendleft(song_id)
+        self.count((song_id,), 1)
+
+    def clear(self):
+        """removes all songs"""
+        self.__init__()
+
+    def order(self, position: int) -> str:
+        """returns the song at a position of the (shuffled) order"""
+        if self.shuffled:
+            while self.drawn <= position:  # draws a random song for every position up to the requested one
+                i = self.drawn
+                j = random.randrange(i, len(self.songs))
+                self.swaps[i], self.swaps[j] = self.swaps.get(j, j), self.swaps.get(i, i)
+                self.drawn += 1
+            return self.songs[self.swaps.get(position, position)]
+        return self.songs[position]
+
+    def shuffle(self) -> str | None:
+        """shuffles the enqueued songs and returns the first one of the new order"""
+        self.shuffled = True
+        self.swaps = {}
+        self.drawn = 0
+        if not self.songs:
+            return None
+        if self.current is not None:
+            self.history.append(self.current)
+        self.position = 0
+        self.current = self.order(0)
+        return self.current
+
+    def at_end(self) -> bool:
+        """True if the current song is the last one"""
+        return not self.upnext and self.position >= len(self.songs) - 1
+
+    def next(self) -> str | None:
+        """moves on to the next song (wraps around) and returns it"""
+        if self.current is not None:
+            self.history.append(self.current)
+        if self.upnext:
+            self.current = self.upnext.popleft()
+            self.count((self.current,), -1)
+        elif self.songs:
+            self.position = (self.position + 1) % len(self.songs)
+            self.current = self.order(self.position)
+        else:
+            self.current = None
+        return self.current
+
+    def prev(self) -> str | None:
+        """goes back to the previously played song (or the one before in the order) and returns it"""
+        if self.history:
+            if self.current is not None:  # the song that was left is played again after this one
+                self.upnext.appendleft(self.current)
+                self.count((self.current,), 1)
+            self.current = self.history.pop()
+        elif self.songs:
+            self.position = (self.position - 1) % len(self.songs)
+            self.current = self.order(self.position)
+        return self.current
+
+    def peek_next(self) -> str | None:
+        """returns the song next() would move to"""
+        if self.upnext:
+            return self.upnext[0]
+        if self.songs:
+            return self.order((self.position + 1) % len(self.songs))
+        return None
+
+    def peek_prev(self) -> str | None:
+        """returns the song prev() would move to unless that requires drawing the whole shuffled order"""
+        if self.history:
+            return self.history[-1]
+        if not self.songs or (self.shuffled and self.position == 0 and self.drawn < len(self.songs)):
+            return None
+        return self.order((self.position - 1) % len(self.songs))
+
+
 class MusicPlayer:
-    """a class for playing files"""
+    """a class for playing files. vlc reports the end and progress of songs as events, which are handled through dispatch(func)
+    as vlc must not be called from its own event thread.
+    the songs next to the current one are parsed in advance and the next is loaded into a second player which takes over when the song changes"""
 
     def __init__(self) -> None:
-        self.playlist: list[Path] = [] # the list of files to play
-        self.counter: int = -1 # current position in the songqueue
-        self.proc: vlc.MediaPlayer = vlc.MediaPlayer() # the actual Musicplayer # type: ignore 
+        self.queue = PlayQueue()  # the songs to play
+        self.players: tuple[vlc.MediaPlayer, vlc.MediaPlayer] = (vlc.MediaPlayer(), vlc.MediaPlayer())  # type: ignore
+        self.proc: vlc.MediaPlayer = self.players[0] # the actual Musicplayer (the other one is on standby) # type: ignore 
         self.playing: bool = False # playing or paused
+        self.position: int = 0  # the progress of the current song in seconds (as last reported by vlc)
+        self.preloaded: Path | None = None  # the file loaded into the standby player
+        self.media: dict[Path, vlc.Media] = {}  # parsed media of the songs around the current one
+        self.calls: queue.SimpleQueue[Callable] = queue.SimpleQueue()  # functions for the default dispatch thread
+        self.call_thread: threading.Thread | None = None  # started with the first dispatched function
+        for player in self.players:
+            events = player.event_manager()
+            events.event_attach(vlc.EventType.MediaPlayerEndReached, partial(self.on_event, player, self.ended))
+            events.event_attach(vlc.EventType.MediaPlayerEncounteredError, partial(self.on_event, player, self.failed))
+            events.event_attach(vlc.EventType.MediaPlayerTimeChanged, partial(self.time_changed, player))
+
+    @property
+    def standby(self) -> vlc.MediaPlayer:
+        """the player that is not playing"""
+        return self.players[1] if self.proc is self.players[0] else self.players[0]
+
+    def dispatch(self, func: Callable):
+        """runs func outside of the vlc event thread. by default in a helper thread, UIs replace it to run func on their own thread"""
+        if self.call_thread is None:
+            self.call_thread = threading.Thread(target=self.run_calls, name="player", daemon=True)
+            self.call_thread.start()
+        self.calls.put(func)
+
+    def run_calls(self):
+        """runs the dispatched functions one after another (the default dispatch thread)"""
+        while True:
+            self.calls.get()()
+
+    def on_event(self, player: vlc.MediaPlayer, handler: Callable, event):
+        """called by vlc, dispatches the handler if the event belongs to the current player"""
+        if player is self.proc:
+            self.dispatch(handler)
+
+    def time_changed(self, player: vlc.MediaPlayer, event):
+        """called by vlc (many times per second), only changes of the full second are passed on"""
+        seconds = event.u.new_time // 1000
+        if player is self.proc and seconds != self.position:
+            self.position = seconds
+            self.dispatch(partial(self.progressed, seconds))
 
     @property
     def timer(self):
         """returns the progress of the current song"""
-        return int(self.proc.get_time() / 1000)
+        return self.position
+
+    def load(self, file: Path) -> vlc.Media:
+        """returns the media for a file. it is parsed in the background unless it was preloaded already"""
+        media = self.media.get(file)
+        if media is None:
+            media = vlc.Media(file)
+            media.parse_with_options(vlc.MediaParseFlag.local, 0)
+            self.media[file] = media
+        return media
+
+    def preload(self):
+        """parses the songs before and after the current one and loads the next into the standby player"""
+        self.preloaded = None
+        following, previous = self.queue.peek_next(), self.queue.peek_prev()
+        self.media = {song_file(song): self.load(song_file(song)) for song in (following, previous) if song is not None}  # forgets the others
+        if following is not None and following != self.queue.current:
+            self.preloaded = song_file(following)
+            self.standby.set_media(self.media[self.preloaded])
 
     def play(self, file: Path):
         """play a file"""
-        self.proc.set_media(vlc.Media(file))
-        self.proc.play()
+        self.position = 0
+        if file == self.preloaded:  # the standby player is ready to go so it takes over
+            previous = self.proc
+            self.proc = self.standby
+            self.proc.play()
+            previous.stop()
+        else:
+            self.proc.set_media(self.load(file))
+            self.proc.play()
         self.playing = True
+        self.preload()
 
     def pause(self):
         """pauses playback"""
@@ -436,7 +1659,7 @@ class MusicPlayer:
 
     def continu(self):
         """continues playback (continue is a python keyword so continu)"""
-        if self.playlist != []: # ofc this only works if there is a song to continue
+        if self.queue.current is not None: # ofc this only works if there is a song to continue
             self.playing = True
             self.proc.play()
 
@@ -447,56 +1670,67 @@ class MusicPlayer:
         else:
             self.continu()
 
-    def add(self, file: Path):
-        """adds a song(file) to the queue"""
-        self.playlist.append(file)
-        if self.counter == -1: # conter == -1 represents there is no song to play
-            self.counter = 0
-            self.play(self.playlist[0])
-
-    def add_list(self, songs: list[Path]):
-        """adds a list of song(files) to the queue"""
-        for file in songs:
-            self.add(file)
+    def play_song(self, song_id: str | None):
+        """plays a song (if there is one)"""
+        if song_id is not None:
+            self.play(song_file(song_id))
+
+    def add(self, song_id: str):
+        """adds a song to the queue"""
+        self.add_list((song_id,))
+
+    def add_list(self, songs: Iterable[str]):
+        """adds songs to the queue"""
+        self.queue.extend(songs)
+        if self.queue.current is None: # there was no song to play
+            self.play_song(self.queue.next())
+        else:  # the next song may have changed
+            self.preload()
+
+    def play_next(self, song_id: str):
+        """inserts a song to be played after the current one"""
+        self.queue.play_next(song_id)
+        if self.queue.current is None:
+            self.play_song(self.queue.next())
+        else:
+            self.preload()
 
     def clear_list(self):
         """resets the queue"""
-        self.playlist = []
-        self.counter = -1
-
-    def query(self):
-        """updates the Musicplayer -> starts next song if current is finished"""
-        if self.proc.get_state() == 6: # get_state() == 6 means the current song is finished
-            if self.counter < len(self.playlist) - 1: # if there is a next song to play
-                self.counter += 1 # then play the next song
-                self.play(self.playlist[self.counter])
-            else:
-                self.playing = False # else stop playing
+        self.queue.clear()
+
+    def ended(self):
+        """starts the next song once the current is finished"""
+        if not self.queue.at_end(): # if there is a next song to play
+            self.play_song(self.queue.next()) # then play the next song
+        else:
+            self.playing = False # else stop playing
+
+    def failed(self):
+        """skips songs that can't be played"""
+        if self.queue.current is not None:
+            logging.error(f"could not play {self.queue.current}")
+        self.ended()
+
+    def progressed(self, seconds: int):
+        """called every second while playing (meant to be extended by UIs)"""
 
     def shuffle(self):
-        """randomly shuffles the songqueue"""
-        random.shuffle(self.playlist)
-        self.counter = 0 # and starts to play the now first song
-        self.play(self.playlist[self.counter])
+        """randomly shuffles the songqueue and starts to play the now first song"""
+        self.play_song(self.queue.shuffle())
 
     def next(self):
         """skips the current song if possible (wraps around)"""
-        if len(self.playlist) > 0:
-            self.counter = (self.counter + 1) % len(self.playlist)
-            self.play(self.playlist[self.counter])
+        self.play_song(self.queue.next())
 
     def prev(self):
         """plays the previous song if possible (wraps around)"""
-        if len(self.playlist) > 0:
-            self.counter = (self.counter - 1) % len(self.playlist)
-            self.play(self.playlist[self.counter])
+        self.play_song(self.queue.prev())
 
     @property
-    def song(self):
-        """returns the title of the current playing song or None"""
-        if self.playlist != []:
-            return self.playlist[self.counter].stem
-        return None
+    def song(self) -> str | None:
+        """returns the id of the current playing song or None"""
+        return self.queue.current
 
 
 class MusicPlayerWithScreen(MusicPlayer):
@@ -506,17 +1740,17 @@ class MusicPlayerWithScreen(MusicPlayer):
         self.screen = screen # a 1 Line curses.screen object
 
     def disp(self):
-        """displays information about the current song on the screen"""
-        self.screen.clear()
-        if self.playing: # if there is something to report
-            file = self.playlist[self.counter]
-            song_id = file.stem
-            addstr(self.screen, 0, 0, info_string(song_data.val[song_id], self.timer)) # then print so pretty info about the current song and progress
-            self.screen.refresh()
-
-    def query(self):
-        """updates the player (plays next song if finished) and disps the lates information"""
-        super().query()
+        """displays information about the current song on the screen (shown with the next curses.doupdate())"""
+        lines = {}
+        if self.playing and self.song in song_data.val: # if there is something to report
+            lines[0] = ((info_string(song_data.val[self.song], self.timer), curses.A_NORMAL),) # then print so pretty info about the current song and progress
+        Frame.of(self.screen).draw(lines)  # a new second only changes a few characters
+
+    def progressed(self, seconds: int):
+        self.disp()
+
+    def ended(self):
+        super().ended()
         self.disp()
 
     def play(self, file: Path):
@@ -524,18 +1758,318 @@ class MusicPlayerWithScreen(MusicPlayer):
         self.disp()
 
 
+class Download:
+    """a song that is queued or downloaded by the DownloadManager"""
+
+    def __init__(self, song: Song, priority: int):
+        self.song = song
+        self.priority = priority  # lower priorities are downloaded first
+        self.state: Literal["queued", "running", "processing", "done", "failed", "cancelled"] = "queued"
+        self.progress: float = 0  # from 0 to 1
+        self.times: dict[str, tuple[float, float]] = {}  # start and end of the stages ("fetch" and "postprocess")
+        self.error: Exception | None = None
+        self.callbacks: list[Callable[[Download], Any]] = []  # called once the download is over (done, failed or cancelled)
+        self.cancelled = threading.Event()
+
+
+class DownloadManager:
+    """downloads songs in a bounded pool of worker threads. queued downloads are started by priority and
+    a song that is already queued or running is not downloaded again.
+    the workers only fetch the songs and hand them to a second pool (one thread per cpu core running ffmpeg) for converting,
+    so the network and the cpu are both busy with batches of downloads.
+    callbacks and listeners are run through dispatch(func), which UIs replace to run them on their own thread"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.threads: list[threading.Thread] = []  # started with the first download
+        self.processors = ThreadPoolExecutor(os.cpu_count() or 1, "postprocess")
+        self.queue: queue.PriorityQueue[tuple[int, int, Download]] = queue.PriorityQueue()
+        self.order = itertools.count()  # downloads with the same priority start in the order they were submitted
+        self.downloads: dict[str, Download] = {}  # queued and running downloads by song id
+        self.lock = threading.Lock()
+        self.listeners: list[Callable[[Download], Any]] = []  # called whenever a download changes (eg. progress)
+        self.dispatch: Callable[[Callable], Any] = lambda func: func()
+
+    def submit(self, song: Song, priority: int = 0, callback: Callable[[Download], Any] | None = None) -> Download:
+        """queues a song for downloading. callback(download) is dispatched once it is over"""
+        with self.lock:
+            download = self.downloads.get(song.id)
+            if download is None:
+                download = Download(song, priority)
+                self.downloads[song.id] = download
+                self.queue.put((priority, next(self.order), download))
+            elif download.state == "queued" and priority < download.priority:
+                # queued again with a better position, the old queue entry is skipped by the workers
+                download.priority = priority
+                self.queue.put((priority, next(self.order), download))
+            if callback is not None:
+                download.callbacks.append(callback)
+            while len(self.threads) < self.workers:
+                thread = threading.Thread(target=self.work, name=f"download {len(self.threads)}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+        self.notify(download)
+        return download
+
+    def cancel(self, song_id: str):
+        """stops a queued or running download"""
+        with self.lock:
+            download = self.downloads.get(song_id)
+            if download is None:
+                return
+            download.cancelled.set()  # a running download is stopped by its progress hook
+            if download.state != "queued":
+                return
+            download.state = "cancelled"  # so no worker starts it
+        self.finish(download, "cancelled")
+
+    def work(self):
+        """the worker threads take the next download from the queue until the program ends"""
+        while True:
+            priority, _, download = self.queue.get()
+            with self.lock:
+                if download.state != "queued" or download.priority != priority:
+                    continue  # cancelled or requeued with another priority
+                download.state = "running"
+            try:
+                self.fetch(download)
+            except Exception as e:  # eg. a failing listener of the db, the worker has to survive it
+                self.fail(download, e)
+
+    def fetch(self, download: Download):
+        """the first stage: downloads a song and hands it to the converting pool"""
+        self.notify(download)
+        if song_file(download.song.id).is_file():  # already downloaded
+            add_song(download.song)
+            self.finish(download, "done")
+            return
+        start = time.monotonic()
+        try:
+            fetched = fetch_song(download.song, progress=partial(self.progress, download))
+        except yt_dlp.utils.DownloadCancelled:
+            self.finish(download, "cancelled")
+            return
+        download.times["fetch"] = (start, time.monotonic())
+        # converting happens in the other pool while this worker already fetches the next song
+        download.state = "processing"
+        self.notify(download)
+        self.processors.submit(self.postprocess, download, fetched)
+
+    def postprocess(self, download: Download, fetched: dict[str, Any]):
+        """the second stage: converts and tags a fetched song"""
+        start = time.monotonic()
+        try:
+            postprocess_song(download.song, **fetched, codec=config.val["codec"])
+            download.times["postprocess"] = (start, time.monotonic())
+            add_song(download.song)
+        except Exception as e:  # the executor would swallow it and leave the download processing forever
+            self.fail(download, e)
+            return
+        self.finish(download, "done")
+
+    def fail(self, download: Download, error: Exception):
+        """ends a download that went wrong"""
+        logging.error(f"could not download {download.song.id}: {error}")
+        download.error = error
+        self.finish(download, "failed")
+
+    def progress(self, download: Download, progress: float):
+        """called by the download with its current progress"""
+        if download.cancelled.is_set():
+            raise yt_dlp.utils.DownloadCancelled()
+        if progress - download.progress >= 0.01 or progress == 1:  # avoids flooding the UI with tiny updates
+            download.progress = progress
+            self.notify(download)
+
+    def finish(self, download: Download, state):
+        """ends a download and runs its callbacks"""
+        with self.lock:
+            self.downloads.pop(download.song.id, None)
+        download.state = state
+        self.notify(download)
+        for callback in download.callbacks:
+            self.call(partial(callback, download))
+
+    def notify(self, download: Download):
+        """tells all listeners that a download changed"""
+        for listener in self.listeners:
+            self.call(partial(listener, download))
+
+    def call(self, func: Callable):
+        """dispatches a callback or listener. a failing one is only logged, so it can't stop a download half way"""
+        try:
+            self.dispatch(func)
+        except Exception:
+            logging.exception("a download listener failed")
+
+    def status(self) -> str:
+        """a short description of the running downloads like "downloading 2 songs (45%)" or "" if there are none"""
+        with self.lock:
+            active = list(self.downloads.values())
+        if not active:
+            return ""
+        progress = sum(download.progress for download in active) / len(active)
+        return f"downloading {len(active)} song{'s' if len(active) > 1 else ''} ({int(progress * 100)}%)"
+
+
+class Importer:
+    """imports a list of song ids with overlapping stages: several threads look up metadata while the DownloadManager
+    fetches and converts the songs and the main thread adds them to the db. finished songs are remembered in a checkpoint
+    file so an interrupted import continues where it stopped"""
+    stages = ("lookup", "fetch", "postprocess", "register")
+
+    def __init__(self, name: str, songs: list[str]):
+        self.songs = songs
+        # the ids of all songs that are already imported
+        self.checkpoint_file = data_dir.joinpath("imports", name)
+        self.checkpoint = Pointer([])
+        data.load(self.checkpoint_file, self.checkpoint, default=[])
+        self.failed: list[str] = []
+        # per stage: number of songs, first start and last end
+        self.stats: dict[str, list[float]] = {stage: [0, 0, 0] for stage in self.stages}
+        self.stats_lock = threading.Lock()
+
+    def record(self, stage: str, start: float, end: float):
+        """adds the time a song spent in a stage to the stats"""
+        with self.stats_lock:
+            stats = self.stats[stage]
+            stats[1] = start if stats[0] == 0 else min(stats[1], start)
+            stats[2] = max(stats[2], end)
+            stats[0] += 1
+
+    def timed(self, stage: str, func: Callable, *args):
+        """runs func and adds the time to the stats of stage"""
+        start = time.monotonic()
+        try:
+            return func(*args)
+        finally:
+            self.record(stage, start, time.monotonic())
+
+    @staticmethod
+    def lookup(song_id: str) -> Song:
+        """gets the metadata of a song"""
+        return Song.normalize(yt.get_song(song_id), song_id)
+
+    def run(self, on_progress: Callable[[int, int, Song | None], Any] = lambda done, total, song: None):
+        """imports all songs. on_progress(done, total, song) is called on the main thread after each song (song is None if it failed)"""
+        done = set(self.checkpoint.val)
+        todo = [song_id for song_id in dict.fromkeys(self.songs) if song_id not in done]  # without duplicates
+        finished: queue.Queue[tuple[str, Song | None]] = queue.Queue()  # songs that passed (or failed) the download
+
+        def downloaded(download: Download):
+            for stage, (start, end) in download.times.items():
+                self.record(stage, start, end)
+            finished.put((download.song.id, download.song if download.state == "done" else None))
+
+        def looked_up(song_id: str, future: Future):
+            if future.exception() is not None:
+                logging.error(f"could not find {song_id}: {future.exception()}")
+                finished.put((song_id, None))
+                return
+            # the download starts as soon as the metadata is known (after downloads started in the UI)
+            downloads.submit(future.result(), priority=1, callback=downloaded)
+
+        with ThreadPoolExecutor(config.val["lookup_workers"], "lookup") as lookups:
+            for song_id in todo:
+                lookups.submit(self.timed, "lookup", self.lookup, song_id).add_done_callback(partial(looked_up, song_id))
+
+            for i in range(len(todo)):
+                song_id, song = finished.get()
+                if song is None:
+                    self.failed.append(song_id)
+                else:
+                    self.timed("register", self.register, song_id)
+                on_progress(len(done) + i + 1, len(done) + len(todo), song)
+
+        if not self.failed:  # nothing left to resume
+            data.mark_saved(self.checkpoint)  # or the Saver would write it right back
+            self.checkpoint_file.unlink(missing_ok=True)
+
+    def register(self, song_id: str):
+        """remembers a song as imported (the DownloadManager already added it to the db)"""
+        self.checkpoint.val.append(song_id)
+
+    def report(self) -> str:
+        """a summary of the throughput of every stage"""
+        lines = []
+        for stage in self.stages:
+            count, start, end = self.stats[stage]
+            duration = end - start
+            rate = f"{count / duration:.2f} songs/s" if duration > 0 else "-"
+            lines.append(f"{stage}: {int(count)} songs in {duration:.1f}s ({rate})")
+        if self.failed:
+            lines.append(f"{len(self.failed)} songs failed, run the import again to retry them")
+        return "\n".join(lines)
+
+
 music_player: MusicPlayer  # placeholder for musicplayer
 data: Datamanager  # placeholder for Datamanager
+downloads: DownloadManager  # placeholder for the DownloadManager
+thumbnails: ThumbnailCache  # placeholder for the ThumbnailCache
+
+
+class Frame:
+    """remembers the lines last drawn on a curses window so drawing a new frame only rewrites the lines that changed
+    (and curses only sends the characters of those that actually differ to the terminal).
+    drawing just marks the window for output, so everything drawn is sent at once by curses.doupdate()"""
+    frames: dict[int, "Frame"] = {}  # the frame of each window (tabs share one window)
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.lines: dict[int, tuple[tuple[str, int], ...]] = {}  # y -> the (text, attributes) parts of the line currently on the window
+
+    @classmethod
+    def of(cls, screen) -> "Frame":
+        """returns the frame of a window"""
+        if id(screen) not in cls.frames:
+            cls.frames[id(screen)] = cls(screen)
+        return cls.frames[id(screen)]
+
+    @classmethod
+    def invalidate(cls):
+        """forgets what is on all windows (after they were erased)"""
+        for frame in cls.frames.values():
+            frame.lines = {}
+
+    def draw(self, lines: dict[int, tuple[tuple[str, int], ...]]):
+        """draws a new frame. lines that are the same as in the last one are skipped and lines missing in the new one are cleared"""
+        width = self.screen.getmaxyx()[1]
+        for y, parts in lines.items():
+            if self.lines.get(y) != parts:
+                self.screen.move(y, 0)
+                self.screen.clrtoeol()
+                x = 0
+                for text, attributes in parts:
+                    if x >= width:
+                        break
+                    # cut to the window, as the rest would wrap onto the next line (which is not drawn again if it didn't change)
+                    addstr(self.screen, y, x, text[:width - x], attributes)
+                    x += len(text)
+        for y in self.lines.keys() - lines.keys():
+            self.screen.move(y, 0)
+            self.screen.clrtoeol()
+        self.lines = lines
+        self.screen.noutrefresh()
 
 
 def delline(screen, y: int, refresh=False):
     """clears the line y of the provided screen and optionally updates the screen"""
     screen.move(y, 0)
     screen.clrtoeol()
+    Frame.of(screen).lines.pop(y, None)  # the line has to be drawn again by the next frame
     if refresh:
         screen.refresh()
 
 
+def getkey(screen) -> str:
+    """waits for a key. a wait interrupted by a signal (like a resize of the terminal) is continued"""
+    while True:
+        try:
+            return screen.getkey()
+        except curses.error:
+            pass
+
+
 def inputchoice(screen, choices: list) -> int:
     """displays a number of choices to the user and returns the chosen number. -1 if exited"""
     maxy, _ = getmax(screen)
@@ -547,7 +2081,7 @@ def inputchoice(screen, choices: list) -> int:
     key = -1
     # waits for the user to type in a valid number or press esc to exit
     while key < 1 or key > len(choices):
-        key = screen.getkey()
+        key = getkey(screen)
         try:
             key = int(key)
         except ValueError:
@@ -562,8 +2096,8 @@ def inputchoice(screen, choices: list) -> int:
     return key - 1
 
 
-def search(screen) -> dict[str, Any] | None:
-    """asks and searches for a song on YouTube and returns a corresponding song_info dict or None if aborted"""
+def search(screen) -> Song | None:
+    """asks and searches for a song on YouTube and returns a corresponding Song or None if aborted"""
     # asks the user for a searchquery
     search_str = inputstr(screen, "Search Song: ")
     if search_str is None:
@@ -577,13 +2111,13 @@ def search(screen) -> dict[str, Any] | None:
         return
 
     # presents the user with some pretty choices based on the results of the query
-    choices: list[str] = list(map(song_string, results))
+    songs = list(map(Song.normalize, results))
+    choices: list[str] = list(map(song_string, songs))
     chosen = inputchoice(screen, choices)
     if chosen == -1:
         return
-    # returns the metadata dict about the selected song
-    chosen = results[chosen]
-    return chosen
+    # returns the metadata about the selected song
+    return songs[chosen]
 
 
 def inputstr(screen, question: str) -> str | None:
@@ -595,11 +2129,12 @@ def inputstr(screen, question: str) -> str | None:
     screen.refresh()
     # waits for the user to input a string and press enter (also displays the current input)
     text = ""
-    key = screen.getkey()
+    key = getkey(screen)
     while key != "\n": # as long as the current key is not enter
         if key == "\x7f":  # backspace
             text = text[:-1]
         elif key == "\x1b":  # escape
+            delline(screen, maxy, True)
             return
         else:
             text += key # add the current pressed key to the input
@@ -607,7 +2142,7 @@ def inputstr(screen, question: str) -> str | None:
         addstr(screen, maxy, len(question), text + "   ")
         screen.refresh()
         # and wait for the next key
-        key = screen.getkey()
+        key = getkey(screen)
     # removes everythng about the input
     delline(screen, maxy, True)
     return text
@@ -619,113 +2154,207 @@ def info(screen, text: str, important=True) -> None:
     addstr(screen, maxy, 0, text + " press any key to continue")
     screen.refresh()
     if important:
-        screen.getkey()
+        getkey(screen)
         delline(screen, maxy, True)
 
 
-def download_song(song_info: dict, on_finished: Callable=lambda: None) -> None:
-    """downloads a song from a song_info dict returned by yt.search() and executes some arbitrary code after the download is finished"""
-    song_id = song_info["videoId"]
+def add_song(song: Song):
+    """adds the metadata of a downloaded song to the songdb"""
+    song_data.val[song.id] = song  # the Saver will save the songdb soon
 
-    def save_data(): # if the download is finished
-        song_data.val[song_id] = song_info # add the metadata to the songdb
-        data.save_all()
-        on_finished() # and run additional code
 
-    if Path.is_file(song_dir.joinpath(f"{song_id}.mp3")): # if the file already exists
-        save_data() # skip the download
-        return
+def fetch_song(song: Song, progress: Callable[[float], Any] | None = None) -> dict[str, Any]:
+    """downloads the audio and thumbnail of a song as they are (without converting anything) to the download dir.
+    returns the arguments for postprocess_song(). progress(fraction) is called while downloading"""
+    song_id = song.id
 
+    def progress_hook(status: dict):  # called by yt-dlp
+        total = status.get("total_bytes") or status.get("total_bytes_estimate")
+        if progress is not None and status["status"] == "downloading" and total:
+            progress(status["downloaded_bytes"] / total)
 
     # generated by cli_to_api.py https://github.com/yt-dlp/yt-dlp/blob/master/devscripts/cli_to_api.py
     yt_dlp_opts = {'extract_flat': 'discard_in_playlist',
-                    'final_ext': 'mp3',
-                    'format': 'bestaudio/best',
+                    # m4a can be stored as it is with a cover
+                    'format': 'bestaudio[ext=m4a]/bestaudio/best' if config.val["codec"] == "original" else 'bestaudio/best',
                     'fragment_retries': 10,
                     'ignoreerrors': 'only_download',
-                    'outtmpl': {'default': f"{song_dir}/{song_id}.mp3", 'pl_thumbnail': ''},
-                    'postprocessors': [{'key': 'FFmpegExtractAudio',
-                                        'nopostoverwrites': False,
-                                        'preferredcodec': 'mp3',
-                                        'preferredquality': '0'},
-                                        {'add_chapters': True,
-                                        'add_infojson': 'if_exists',
-                                        'add_metadata': True,
-                                        'key': 'FFmpegMetadata'},
-                                        {'already_have_thumbnail': False, 'key': 'EmbedThumbnail'},
-                                        {'key': 'FFmpegConcat',
-                                        'only_multi_video': True,
-                                        'when': 'playlist'}],
+                    'outtmpl': {'default': f"{download_dir}/{song_id}.%(ext)s", 'pl_thumbnail': ''},
+                    'progress_hooks': [progress_hook],
+                    'quiet': True,
+                    'noprogress': True,
                     'retries': 10,
                     'writethumbnail': True}
 
-    # downloads the song with the thumbnail embedded as an mp3 file to the song dir
     with yt_dlp.YoutubeDL(yt_dlp_opts) as ydl:
-        ydl.download([f"https://www.youtube.com/watch?v={song_id}"])
+        info = ydl.extract_info(f"https://www.youtube.com/watch?v={song_id}")
+    try:
+        audio = Path(info["requested_downloads"][0]["filepath"])  # type: ignore
+    except (TypeError, KeyError, IndexError):
+        audio = None
+    if audio is None or not audio.is_file():
+        raise Exception(f"could not download {song_id}")
+    thumbnails = [Path(thumbnail["filepath"]) for thumbnail in info.get("thumbnails") or [] if thumbnail.get("filepath")]  # type: ignore
+    return {"audio": audio, "thumbnail": thumbnails[0] if thumbnails else None, "acodec": info.get("acodec") or ""}  # type: ignore
+
+
+# the container to copy an audio codec to without converting (for the "remux" codec)
+remux_containers = {"opus": ".opus", "vorbis": ".ogg", "mp4a": ".m4a", "aac": ".m4a", "mp3": ".mp3", "flac": ".flac"}
+
+
+def postprocess_song(song: Song, audio: Path, thumbnail: Path | None, acodec: str, codec: str) -> Path:
+    """converts a file downloaded by fetch_song() according to the codec policy, tags it and moves it to the song_dir.
+    "mp3" converts everything to mp3, "remux" copies the original audio into a fitting container (eg. opus or m4a)
+    and "original" keeps the downloaded container"""
+    if codec == "mp3":
+        extension = ".mp3"
+        audio_args = ["-c:a", "libmp3lame", "-q:a", "0", "-id3v2_version", "3"]
+    else:
+        extension = remux_containers.get(acodec.split(".")[0], ".mka") if codec == "remux" else audio.suffix
+        audio_args = ["-c:a", "copy"]
+    target = song_dir.joinpath(f"{song.id}{extension}")
+    temp = song_dir.joinpath(f".{song.id}{extension}")  # so a half converted file is never mistaken for the song
+
+    # mp3 and m4a can embed the thumbnail as cover, other containers get the thumbnail next to them
+    embed = thumbnail is not None and extension in (".mp3", ".m4a")
+    command = ["ffmpeg", "-y", "-loglevel", "error", "-i", str(audio)]
+    if embed:
+        command += ["-i", str(thumbnail), "-map", "0:a", "-map", "1:v", "-c:v", "mjpeg", "-disposition:v", "attached_pic"]
+    else:
+        command += ["-map", "0:a"]
+    command += audio_args + ["-metadata", f"title={song.title}", "-metadata", f"artist={song.artist}", str(temp)]
+    subprocess.run(command, check=True, capture_output=True)
+    os.replace(temp, target)
+
+    audio.unlink()
+    if thumbnail is not None:
+        if extension == ".mp3":
+            thumbnail.unlink()
+        else:
+            os.replace(thumbnail, song_dir.joinpath(f"{song.id}{thumbnail.suffix}"))
+    song_files[song.id] = target
+    return target
 
-    save_data()
-    logging.info("finished")
 
+audio_extensions = (".mp3", ".m4a", ".opus", ".ogg", ".webm", ".mka", ".aac", ".flac")
+song_files: dict[str, Path] = {}  # song id -> downloaded file, filled by scanning the song_dir once
+song_files_scanned = False
 
 
 def song_file(song_id: str) -> Path:
-    """returns the Path to a song by id"""
-    return Path(f"{song_dir}/{song_id}.mp3")
+    """returns the Path to a song by id. the extension depends on the codec the song was downloaded with (mp3 if it is not downloaded)"""
+    global song_files_scanned
+    if not song_files_scanned:  # the first call finds all songs at once
+        with os.scandir(song_dir) as files:
+            for f in files:
+                file = Path(f)
+                if file.suffix in audio_extensions:
+                    song_files.setdefault(file.stem, file)
+        song_files_scanned = True
+    return song_files.get(song_id) or song_dir.joinpath(f"{song_id}.mp3")
 
 
-def song_string(song_info: dict) -> str:
-    """returns a string representation for a song_info dict according to config"""
-    string = config.val["songstring"]
-    # returns the string specified in the config with ARTIST replaced by the actual artist usw..
-    return string_replace(string, song_info)
+class Fields(dict):
+    """the values for the fields of a Template. missing fields are left as they are"""
 
+    def __missing__(self, key: str) -> str:
+        return key
 
-def info_string(song_info: dict, play_time: float) -> str:
-    """returns a string representing the currently playing track"""
-    string = config.val["infostring"]
 
-    # eg. CURRENT_TIME -> 3:24
-    formatted_time = format_time(int(play_time))
-    string = string.replace("CURRENT_TIME", formatted_time)
+class Template:
+    """a display template from the config (like "TITLE - ARTIST - LENGHT") compiled once into a format string with a slot for each field"""
+    fields = re.compile("TITLE|ARTIST|LENGHT|CURRENT_TIME|BAR")
 
-    # eg. BAR -> ==‣──────
-    progress = int(int(play_time) / song_info["duration_seconds"] * config.val["barlenght"])
-    bar = "═" * progress + "‣" + "─" * (config.val["barlenght"] - progress - 1)
-    string = string.replace("BAR", bar)
+    def __init__(self, string: str):
+        # braces in the template are escaped, the fields become slots
+        self.format = self.fields.sub(lambda match: "{" + match.group() + "}", string.replace("{", "{{").replace("}", "}}"))
 
-    # replaces some more stuff
-    return string_replace(string, song_info)
+    def render(self, fields: Fields) -> str:
+        return self.format.format_map(fields)
 
 
-def format_time(seconds: int) -> str:
-    """returns a prefix free representation of seconds eg. 3:24 or 1:05:23"""
-    # gets a string representation of the seconds
-    formatted_time = time.strftime("%H:%M:%S", time.gmtime(seconds))
-    # removes the prefix eg 00:03:24 -> 3:24
-    prefix = str(re.findall("^[0:]{1,4}", formatted_time)[0])
-    formatted_time = formatted_time.replace(prefix, "")
-    return formatted_time
+templates: dict[str, Template] = {}  # the compiled templates of the config by name
+rendered: dict[str, dict[str, str]] = {}  # template name -> song id -> the song rendered with the template
 
 
-def string_replace(string: str, song_info) -> str:
-    """replaces varoius KEYs in a string like TITLE with the info in the song_info dict"""
-    try:
-        string = string.replace("TITLE", song_info["title"])
-    except:
-        string = string.replace("TITLE", "")
+def template(name: str) -> Template:
+    """returns the compiled template of the config with the given name (eg. "songstring")"""
+    compiled = templates.get(name)
+    if compiled is None:
+        compiled = templates[name] = Template(config.val[name])
+    return compiled
 
-    try:
-        string = string.replace("ARTIST", song_info["artists"][0]["name"])
-    except:
-        string = string.replace("ARTIST", "")
 
-    try:
-        string = string.replace("LENGHT", song_info["duration"])
-    except:
-        string = string.replace("LENGHT", "")
+def song_fields(song: Song) -> Fields:
+    """the values of the fields describing a song"""
+    return Fields(TITLE=song.title, ARTIST=song.artist, LENGHT=song.duration)
+
+
+def render(name: str, song: Song) -> str:
+    """returns a song rendered with a template of the config (cached until the song or the template changes)"""
+    cache = rendered.setdefault(name, {})
+    string = cache.get(song.id)
+    if string is None:
+        string = cache[song.id] = template(name).render(song_fields(song))
     return string
 
 
+def render_id(name: str, song_id: str) -> str:
+    """like render() but only looks up the song if it is not cached. raises a KeyError for unknown songs"""
+    string = rendered.get(name, {}).get(song_id)
+    if string is None:
+        string = render(name, song_data.val[song_id])
+    return string
+
+
+def forget_songs(pointer: Pointer, change: dict):
+    """forgets the rendered strings of changed songs (subscribed to song_data)"""
+    match change:
+        case {"op": "set" | "del", "key": song_id}:
+            for cache in rendered.values():
+                cache.pop(song_id, None)
+        case _:
+            rendered.clear()
+
+
+def forget_templates(pointer: Pointer, change: dict):
+    """forgets changed templates and the strings rendered with them (subscribed to config)"""
+    match change:
+        case {"op": "set" | "del", "key": name}:
+            templates.pop(name, None)
+            rendered.pop(name, None)
+        case _:
+            templates.clear()
+            rendered.clear()
+
+
+def song_string(song: Song) -> str:
+    """returns a string representation for a song according to config"""
+    # returns the string specified in the config with ARTIST replaced by the actual artist usw..
+    return render("songstring", song)
+
+
+def info_string(song: Song, play_time: float) -> str:
+    """returns a string representing the currently playing track"""
+    fields = song_fields(song)
+    # eg. CURRENT_TIME -> 3:24
+    fields["CURRENT_TIME"] = format_time(int(play_time))
+    # eg. BAR -> ==‣──────
+    length = config.val["barlenght"]
+    progress = int(int(play_time) / max(song.duration_seconds, 1) * length)
+    fields["BAR"] = "═" * progress + "‣" + "─" * (length - progress - 1)
+    return template("infostring").render(fields)
+
+
+def format_time(seconds: int) -> str:
+    """returns a prefix free representation of seconds eg. 3:24 or 1:05:23"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02}:{seconds:02}"
+    return f"{minutes}:{seconds:02}"
+
+
 def getmax(screen) -> tuple[int, int]:
     """returns the bottom most corner of the screen"""
     maxy, maxx = screen.getmaxyx()
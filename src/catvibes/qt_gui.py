@@ -4,16 +4,19 @@ from PyQt6.QtWidgets import (
     QProgressBar,
     QPushButton,
     QMainWindow,
-    QScrollArea,
+    QListView,
+    QAbstractItemView,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QStyleOptionButton,
     QVBoxLayout,
     QWidget,
     QGridLayout,
-    QHBoxLayout,
     QLabel,
     QTabWidget,
     QLineEdit,
     QCompleter,
-    QMenu, QLayout,
+    QMenu,
     QStyleFactory,
     QStyle,
     QDialog,
@@ -30,10 +33,17 @@ from PyQt6.QtGui import (
     QStandardItemModel,
     QStandardItem,
     QCursor,
-    QIcon
+    QIcon,
+    QPainter
 )
 
 from PyQt6.QtCore import (
+    QAbstractItemModel,
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QRect,
     QTimer,
     Qt,
     QSize,
@@ -43,12 +53,20 @@ from PyQt6.QtCore import (
 )
 
 
+import base64
+import difflib
+import glob
+import os
 import sys
+from collections import OrderedDict
 from pathlib import Path
 from functools import partial
 import eyed3
-import requests
+import mutagen
+import mutagen.flac
+import mutagen.mp4
 import logging
+from concurrent.futures import Future
 
 # these imports are written so they work if run as a python module
 try:
@@ -69,9 +87,13 @@ class MainWindow(QMainWindow):
         layout = QGridLayout()
         layout.setContentsMargins(0, 0, 0, 0)
 
+        # functions from other threads (downloads and player events) are run on the Qt mainthread
+        self.dispatcher = Dispatcher()
+
         # the Musicplayer is exposed as a global var to access the underlying MusicPlayer
         global player
         player = PlayerWidget()
+        player.dispatch = self.dispatcher.call.emit  # type: ignore
         lib.music_player = player
         layout.addWidget(player, 0, 1)  # and the Windget itself is placed in the 2nd column
 
@@ -88,7 +110,7 @@ class MainWindow(QMainWindow):
                 r = dialog.exec()
                 if r == 100:  # returncode of 100 means everythong is fine
                     name = dialog.text.text()  # retreive the inputtext
-                    temp = lib.Pointer([])  # create a new playlist with the given name
+                    temp = lib.Playlist()  # create a new playlist with the given name
                     lib.data.load(lib.playlist_dir.joinpath(name), temp, default=[])
                     playlists.val[name] = temp
                     playlists_widget.insertTab(len(playlists.val.keys()), PlaylistWidget(temp), name)  # and add a tab with a Widget for the playlist
@@ -111,59 +133,172 @@ class MainWindow(QMainWindow):
         layout.addWidget(playlists_widget, 0, 0)
         layout.setColumnStretch(0, 2)
 
-        # every 100 ms the Musicplayer refreshs and potentially plays the next song
-        self.timer = QTimer()
-        self.timer.start(100)
-        self.timer.timeout.connect(player.query)
-
         # this places everything in the mainwindow
         central_widget = QWidget()
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
 
+        # downloads run in the background and report back on the Qt mainthread
+        lib.downloads.dispatch = self.dispatcher.call.emit
+        # their progress is shown in the statusbar
+        lib.downloads.listeners.append(lambda download: self.statusBar().showMessage(lib.downloads.status()))  # type: ignore
+
+    def resizeEvent(self, a0):
+        # the musicplayer gets enough space for its cover
+        player.setMinimumWidth(player.get_icon_scale() + 20)
+        super().resizeEvent(a0)
 
-class SongWidget(QWidget):
-    """a Widget to Display a Simple Button with an Cover and Info about a song along with controlls on how to play the song"""
-    # IMPORTANT: all button actions should be connected from the owning widget. on its own it does nothing (the widget itself know nothing about its position in a playlist so how could it possibly start playing a playlist from a specific point)
 
-    def __init__(self, song_id: str):
+class Dispatcher(QObject):
+    """runs functions emitted from other threads on the Qt mainthread"""
+    call = pyqtSignal(object)
+
+    def __init__(self):
         super().__init__()
-        self.id = song_id  # the main identifier of the Song is its ID (eg. sdjgf234bn)
-        layout = QHBoxLayout()  # the components are placed on a horizontal line
-        # tries to get the metadata about the song
-        if song_id not in song_data.val:
-            raise IndexError("Song not found")
-        songinfo = song_data.val[song_id]
+        self.call.connect(lambda func: func())
 
-        # the Mainbutton for playing the Song
-        self.Button = QPushButton()
-        buttonlayout = QHBoxLayout()
-        self.Button.setLayout(buttonlayout)
-        self.Button.setFixedHeight(80)
 
-        # the songcover is actually a QLabel with an icon
-        self.Icon = QLabel()
-        self.Icon.setPixmap(song_cover_info(song_id)[0])
-        self.Icon.setFixedSize(60, 60)  # of fixed dimensions
-        buttonlayout.addWidget(self.Icon)  # and part of the Mainbutton
-
-        # the some Songmetadata (like the Title) are also displayed on the mainbutton
-        self.Info = QLabel(lib.string_replace(lib.config.val["songstring_qt"], songinfo))
-        self.Info.setMinimumWidth(200)
-        self.Info.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        buttonlayout.addWidget(self.Info)
-
-        # there is also a secondary Button for additional purposes
-        self.MenuButton = QPushButton()
-        self.MenuButton.setIcon(QApplication.style().standardIcon(QStyle.StandardPixmap.SP_CommandLink))  # with just an Icon # type: ignore
-        self.MenuButton.setFixedSize(30, 80)
-
-        # adds the two Buttons to the actual Widget
-        layout.addWidget(self.Button)
-        layout.addWidget(self.MenuButton)
-        layout.setContentsMargins(0, 0, 0, 0)
-        self.setLayout(layout)
-        self.setMinimumWidth(300)
+class PlaylistModel(QAbstractListModel):
+    """provides the songs of a playlist to a view. the view only asks for the rows it displays, so covers and info are only read for visible songs.
+    the model keeps the rows the view knows about and applies every change of the playlist to them as it happens"""
+    changes = pyqtSignal(dict, int)  # a change of the playlist and its version (queued to the Mainthread if made in another thread)
+
+    def __init__(self, playlist: lib.Playlist):
+        super().__init__()
+        self.playlist = playlist
+        self.rows: list[str] = []  # the song ids as currently shown (filled on the first update() so the playlist isn't loaded before it is shown)
+        self.version = 0  # the version of the playlist the rows match
+        self.changes.connect(self.apply)
+        playlist.subscribe(lambda pointer, change: self.changes.emit(change, pointer.version))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        song_id: str = self.rows[index.row()]
+        match role:
+            case Qt.ItemDataRole.DisplayRole:  # some Songmetadata (like the Title)
+                try:
+                    return lib.render_id("songstring_qt", song_id)
+                except KeyError:  # songs missing from the db show their id
+                    return song_id
+            case Qt.ItemDataRole.DecorationRole:  # the songcover
+                return song_cover_info(song_id)[0]
+            case Qt.ItemDataRole.UserRole:  # the main identifier of the Song
+                return song_id
+        return None
+
+    def apply(self, change: dict, version: int):
+        """applies a single change of the playlist to the rows"""
+        if version <= self.version:  # already contained in the rows
+            return
+        match change:
+            case {"op": "append", "value": song_id}:
+                self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows))
+                self.rows.append(song_id)
+                self.endInsertRows()
+            case {"op": "extend", "values": song_ids}:
+                if song_ids:
+                    self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(song_ids) - 1)
+                    self.rows.extend(song_ids)
+                    self.endInsertRows()
+            case {"op": "insert", "index": index, "value": song_id}:
+                self.beginInsertRows(QModelIndex(), index, index)
+                self.rows.insert(index, song_id)
+                self.endInsertRows()
+            case {"op": "remove", "index": index}:
+                self.beginRemoveRows(QModelIndex(), index, index)
+                del self.rows[index]
+                self.endRemoveRows()
+            case {"op": "move", "from": source, "to": target}:
+                if source != target:
+                    # qt expects the position in front of which the row is placed
+                    self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), target + 1 if target > source else target)
+                    self.rows.insert(target, self.rows.pop(source))
+                    self.endMoveRows()
+            case {"op": "set", "index": index, "value": song_id}:
+                self.rows[index] = song_id
+                self.dataChanged.emit(self.index(index), self.index(index))
+            case _:  # anything else is compared with the rows
+                self.update()
+                return
+        self.version = version
+
+    def update(self):
+        """applies the differences between the shown rows and the playlist to the view"""
+        with self.playlist.lock:
+            new = list(self.playlist.val)
+            self.version = self.playlist.version
+        if new == self.rows:
+            return
+        opcodes = difflib.SequenceMatcher(None, self.rows, new, autojunk=False).get_opcodes()
+        for tag, i1, i2, j1, j2 in reversed(opcodes):  # from the end, so the positions of earlier changes stay valid
+            if tag in ("replace", "delete"):
+                self.beginRemoveRows(QModelIndex(), i1, i2 - 1)
+                del self.rows[i1:i2]
+                self.endRemoveRows()
+            if tag in ("replace", "insert"):
+                self.beginInsertRows(QModelIndex(), i1, i1 + j2 - j1 - 1)
+                self.rows[i1:i1] = new[j1:j2]
+                self.endInsertRows()
+
+
+class SongDelegate(QStyledItemDelegate):
+    """paints each song like a Simple Button with an Cover and Info about the song next to a secondary button for a menu.
+    only visible rows are painted, so there are no widgets per song"""
+    # IMPORTANT: the clicks are only signaled with the row, the owning widget decides what they do
+    play = pyqtSignal(int)  # emitted with the row whose mainbutton was clicked
+    menu = pyqtSignal(int)  # emitted with the row whose secondary button was clicked
+    height = 80
+    menuwidth = 30
+    iconsize = 60
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(300, self.height)
+
+    def rects(self, rect: QRect) -> tuple[QRect, QRect]:
+        """splits the rect of a row into the mainbutton and the secondary button"""
+        return rect.adjusted(0, 0, -self.menuwidth, 0), QRect(rect.right() - self.menuwidth + 1, rect.top(), self.menuwidth, rect.height())
+
+    def button(self, rect: QRect, option: QStyleOptionViewItem) -> QStyleOptionButton:
+        """returns the style of a button which is highlighted if the cursor is above it"""
+        button = QStyleOptionButton()
+        button.rect = rect
+        button.palette = option.palette
+        button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+        if option.state & QStyle.StateFlag.State_MouseOver and rect.contains(option.widget.viewport().mapFromGlobal(QCursor.pos())):  # type: ignore
+            button.state |= QStyle.StateFlag.State_MouseOver
+        return button
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        style = QApplication.style()
+        main, menu = self.rects(option.rect)
+        # the Mainbutton for playing the Song
+        style.drawControl(QStyle.ControlElement.CE_PushButton, self.button(main, option), painter)  # type: ignore
+        # with the songcover
+        margin = (self.height - self.iconsize) // 2
+        painter.drawPixmap(QRect(main.left() + margin, main.top() + margin, self.iconsize, self.iconsize), index.data(Qt.ItemDataRole.DecorationRole))
+        # and the Songmetadata
+        painter.save()
+        painter.setPen(option.palette.color(QPalette.ColorRole.ButtonText))
+        painter.drawText(main.adjusted(self.iconsize + 2 * margin, 0, -margin, 0), Qt.AlignmentFlag.AlignCenter, index.data())
+        painter.restore()
+        # the secondary Button just has an Icon
+        button = self.button(menu, option)
+        button.icon = style.standardIcon(QStyle.StandardPixmap.SP_CommandLink)  # type: ignore
+        button.iconSize = QSize(16, 16)
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter)  # type: ignore
+
+    def editorEvent(self, event: QEvent, model: QAbstractItemModel, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        # signals clicks on the buttons
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:  # type: ignore
+            main, menu = self.rects(option.rect)
+            if menu.contains(event.position().toPoint()):  # type: ignore
+                self.menu.emit(index.row())
+            else:
+                self.play.emit(index.row())
+            return True
+        return False
 
 
 class thread(QThread):
@@ -185,11 +320,11 @@ class thread(QThread):
 class PlaylistWidget(QWidget):
     """a Widget to Display an Overview of Songs in a Playlist with some basic controlls"""
     minimumwidth = 350
+    suggest_delay = 300  # ms after the last keystroke until autocompletions are requested
 
-    def __init__(self, playlist: lib.Pointer) -> None:
+    def __init__(self, playlist: lib.Playlist) -> None:
         super().__init__()
         self.playlist = playlist  # the main information is all about the playlist
-        self.playlisthash = 0  # there to detect changes of the playlist
 
         layout = QGridLayout()
 
@@ -206,6 +341,12 @@ class PlaylistWidget(QWidget):
         # a textinput for searching for songs
         self.search = QLineEdit()
         self.search.textChanged.connect(self.search_suggest)  # whenever the user changes something offer autocompletions
+        # autocompletions are only requested once the user pauses typing
+        self.suggest_timer = QTimer()
+        self.suggest_timer.setSingleShot(True)
+        self.suggest_timer.setInterval(self.suggest_delay)
+        self.suggest_timer.timeout.connect(self.request_suggestions)
+        self.suggest_request = 0  # counts requests to ignore responses that arrive after newer requests
         self.search.returnPressed.connect(self.find_song)  # when the user presses enter, search for the query
         # set up autocompletion for the searchbox
         self.searchresults = QStandardItemModel()
@@ -223,16 +364,21 @@ class PlaylistWidget(QWidget):
         layout.addWidget(self.searchtype, 0, 3)
 
         # the actual Widget for displaying the Playlist
-        self.playlistarea = QScrollArea()  # it is scrollable
-        self.playlistarea.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)  # but only vertical
-        self.playlistarea.setWidgetResizable(True)
-        self.playlistbox = QWidget()  # the widget that is scrolled just acts as a container
-        self.playlistarea.setWidget(self.playlistbox)
-        self.playlistlayout = QVBoxLayout()  # for a vertical stack of songwidgets
-        self.playlistbox.setLayout(self.playlistlayout)
+        self.model = PlaylistModel(playlist)
+        self.delegate = SongDelegate()
+        self.delegate.play.connect(self.play_from_song)  # clicking on the main Button starts playing the playlist from that point
+        self.delegate.menu.connect(self.show_menu)  # the secondary Button opens a popup Menu
+        self.playlistview = QListView()
+        self.playlistview.setModel(self.model)
+        self.playlistview.setItemDelegate(self.delegate)
+        self.playlistview.setUniformItemSizes(True)  # all rows have the same height, so their positions are known without asking each one
+        self.playlistview.setMouseTracking(True)  # to highlight the button under the cursor
+        self.playlistview.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.playlistview.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.playlistview.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)  # it only scrolls vertical
 
         # the playlistview is added in the 2nd row
-        layout.addWidget(self.playlistarea, 1, 0, 2, 0)
+        layout.addWidget(self.playlistview, 1, 0, 2, 0)
 
         # displays everything and ensures some minimus space
         self.setLayout(layout)
@@ -240,119 +386,181 @@ class PlaylistWidget(QWidget):
         self.setMinimumHeight(400)
 
     def search_suggest(self, text: str):
-        """updates the searchsuggestions for the searchbox based on its contents"""
-        if len(text) > 3:  # only offer completions after 4 input chars
-            self.searchresults.clear()  # delete previous suggestions
-            if lib.yt.online:
-                completions = lib.yt.get_search_suggestions(text)  # and request new ones from YTMusicapi
-                self.searchresults.appendRow([QStandardItem(val) for val in completions])
+        """updates the searchsuggestions for the searchbox based on its contents (after the user stops typing)"""
+        self.suggest_timer.start()  # restarts the timer on every keystroke
+
+    def request_suggestions(self):
+        """requests searchsuggestions for the current text in a background thread"""
+        text = self.search.text()
+        if len(text) > 3 and lib.yt.online:  # only offer completions after 4 input chars
+            self.suggest_request += 1
+
+            def suggestions() -> list[str]:
+                try:
+                    return lib.yt.get_search_suggestions(text)  # request new ones from YTMusicapi
+                except Exception:
+                    return []
+            th = thread(self, suggestions)
+            th.ended.connect(partial(self.show_suggestions, self.suggest_request))  # and display them on the Mainthread
+            th.finished.connect(th.deleteLater)
+            th.start()
+
+    def show_suggestions(self, request: int, completions: list[str]):
+        """replaces the searchsuggestions unless a newer request was made in the meantime"""
+        if request != self.suggest_request:
+            return
+        self.searchresults.clear()  # delete previous suggestions
+        for val in completions:
+            self.searchresults.appendRow(QStandardItem(val))
 
     def find_song(self):
         """initiates the download of a new song (called when enter is pressed in the search box)"""
         if lib.yt.online:
-            def on_finished():  # called when the download finished
-                self.playlist.val.append(song_info["videoId"])  # add song to the playlist
-                self.playlistlayout.addWidget(self.nth_songwidget(len(self.playlist.val) - 1))  # and a corresponding widget
-                self.playlisthash = lib.hash_container(self.playlist.val)  # set the playlisthash to avoid a rebuild of the entire playlist
-
-            # get potential matches
-            song_infos: list[dict[str, Any]] = lib.yt.search(self.search.text(), self.searchtype.currentText(), limit=lib.config.val["results"])
-            # show a dialog window with the potential matches
-            dialog = ChooseSongDialog(song_infos)
+            def on_finished(download: lib.Download):  # called when the download is over
+                if download.state != "done":
+                    return
+                self.playlist.append(song_info.id)  # add song to the playlist (which the view displays on its own)
+
+            query, searchtype = self.search.text(), self.searchtype.currentText()
+
+            def search() -> list[lib.Song] | None:
+                """gets potential matches"""
+                try:
+                    return [lib.Song.normalize(result) for result in lib.yt.search(query, searchtype, limit=lib.config.val["results"])]
+                except Exception as e:
+                    logging.error(f"searching failed: {e}")
+                    return None
+
+            # show a dialog window which displays the potential matches once the search in the background finished
+            dialog = ChooseSongDialog(lib.config.val["results"])
+            th = thread(self, search)
+            th.ended.connect(dialog.show_results)
+            th.finished.connect(th.deleteLater)
+            th.start()
             r = dialog.exec()  # the returncode is < 100 for serveral errors
             if r >= 100:           # but returncode >= 100 means the r-100th song was chosen
-                song_info = song_infos[r - 100]  # get metadata of specific song
-                th = thread(self, lambda: lib.download_song(song_info))  # download via a QThread (this is important because one cant modify a QWidet from a different thread)
-                th.ended.connect(on_finished)  # and run the finished function on the Mainthread when the download has finished
-                th.start()
+                song_info = dialog.songs[r - 100]  # get metadata of specific song
+                lib.downloads.submit(song_info, callback=on_finished)  # download in the background and run the finished function on the Mainthread afterwards
 
     def shuffle(self):
         """plays the entire playlist in a random order"""
-        files: list[Path] = [lib.song_file(song) for song in self.playlist.val]  # a list of all files the playlist contains
-        if set(player.playlist) != set(files):  # checks if an other playlist is currently played (in any order)
+        source = (self.playlist, self.playlist.version)
+        if player.queue.source != source:  # checks if an other playlist (or an older state of this one) is currently played
             player.clear_list()  # if yes then play this playlist
-            player.add_list(files)
+            player.add_list(self.playlist.val)
+            player.queue.source = source
         player.shuffle()  # and ofc shuffle randomly
 
     def play_from_song(self, num: int):
         """plays the playlist from the n-th song till the end"""
         player.clear_list()
-        player.add_list(
-            [lib.song_file(song) for song in self.playlist.val[num:]]
-        )
+        player.add_list(self.model.rows[num:])
 
     def refresh(self) -> None:
-        """populates the playlist with songwidgets to represent the current state of the playlist"""
-        if self.playlisthash != lib.hash_container(self.playlist.val):  # as it takes some time only run it if there are changes
-            self.playlisthash = lib.hash_container(self.playlist.val)  # save the last state when the widget was refreshed
-            clear_layout(self.playlistlayout)  # clear the current layout
-            for i, val in enumerate(self.playlist.val):
-                try:
-                    self.playlistlayout.addWidget(self.nth_songwidget(i))  # and add a songwidget for each song (with buttonactions connected)
-                except (IndexError):
-                    pass
-
-    def nth_songwidget(self, n: int) -> SongWidget:
-        """generates a songwidget for the n-th song in the playlist and connects actions to all buttons"""
-        wid = SongWidget(self.playlist.val[n])  # generates the Songwidget (without actions)
-        wid.Button.clicked.connect(partial(self.play_from_song, n))  # clicking on the main Button starts playing the playlist from that point
-        menu = QMenu()  # we create a popup menu
-        append: QAction = menu.addAction("append")  # with these actions # type: ignore
-        remove: QAction = menu.addAction("remove")  # type: ignore
-        insert: QAction = menu.addAction("play next")  # type: ignore
-        append.triggered.connect(partial(player.add, lib.song_file(self.playlist.val[n])))  # append adds a song to the queue
-        remove.triggered.connect(partial(self.remove_song, n))  # remove deletes the song from the playlist
-
-        def insert_song(n):
-            """inserts a song to be played after the current"""
-            song: Path = lib.song_file(self.playlist.val[n])  # gets the required songfile
-            if player.playlist != []:  # if there is a current playing track
-                player.playlist.insert(player.counter + 1, song)  # insert the song at the position after the current playing song
-            else:
-                player.play(song)  # else just play the song
-        insert.triggered.connect(partial(insert_song, n))  # inset plays the song next
-
-        def contextmenu() -> None:
-            """shows the defined popup menu under the Cursor"""
-            menu.popup(QCursor.pos())
-
-        # the secondary Button opens the popup Menu
-        wid.MenuButton.clicked.connect(contextmenu)
-        return wid
+        """updates the view to represent the current state of the playlist (changes are usually displayed as they happen already)"""
+        if self.model.version != self.playlist.version:
+            self.model.update()
+
+    def show_menu(self, n: int):
+        """shows a popup menu with actions for the n-th song under the Cursor"""
+        song_id: str = self.model.rows[n]
+
+        def position() -> int | None:
+            """returns the current position of the song (the playlist may have changed while the menu was shown)"""
+            if n < len(self.playlist.val) and self.playlist.val[n] == song_id:
+                return n
+            try:
+                return self.playlist.val.index(song_id)
+            except ValueError:  # the song was removed in the meantime
+                return None
+
+        def remove_song():
+            """removes the song from the playlist"""
+            i = position()
+            if i is not None:
+                self.remove_song(i)
+
+        self.menu = QMenu()  # kept as attribute while it is shown
+        append: QAction = self.menu.addAction("append")  # with these actions # type: ignore
+        remove: QAction = self.menu.addAction("remove")  # type: ignore
+        insert: QAction = self.menu.addAction("play next")  # type: ignore
+        append.triggered.connect(partial(player.add, song_id))  # append adds a song to the queue
+        remove.triggered.connect(remove_song)  # remove deletes the song from the playlist
+        insert.triggered.connect(partial(player.play_next, song_id))  # inset plays the song next
+        self.menu.popup(QCursor.pos())
 
     def remove_song(self, n):
         """removes a song from the playlist"""
-        del self.playlist.val[n]
-        self.refresh()
+        self.playlist.remove_at(n)
 
 
 class ChooseSongDialog(QDialog):
-    """a Dialog Window to offer several songs in a pretty way and return the index of the chosen one"""
+    """a Dialog Window to offer several songs in a pretty way and return the index of the chosen one.
+    it opens with placeholders that are filled by show_results() once the search has finished"""
+    thumbnail_loaded = pyqtSignal(int, bytes)  # emitted from the thumbnail threads with the index of the song
 
-    def __init__(self, songs: list[dict[str, Any]]):
+    def __init__(self, placeholders: int):
         super().__init__()
         self.setWindowTitle("Choose Song")
+        self.songs: list[lib.Song] = []
+        self.buttons: list[QPushButton] = []
         layout = QVBoxLayout()
-        for i, song in enumerate(songs):  # for each songmetadata
-            wid = QPushButton(song["title"] + " - " + song["artists"][0]["name"])  # create a Button with TITLE - ARTIST label
+        # tells the user if there is nothing to choose
+        self.message = QLabel()
+        self.message.setStyleSheet("font-size: 20px")
+        self.message.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.message.hide()
+        layout.addWidget(self.message)
+        for i in range(placeholders):  # one Button for each expected song
+            wid = QPushButton("searching...")
+            wid.setEnabled(False)  # which can't be chosen until the song is known
             # each button returns the index of the song it represents
             wid.clicked.connect(partial(self.done, i + 100))   # + 100 to tell apart from codes like 0 which is also emitted on window closing
 
-            # and give each Button a covericon
-            url: str = song["thumbnails"][0]["url"]  # get the location of a thumbnail from the metadata
-            image = QImage()
-            image.loadFromData(requests.get(url).content)
-            pixmap = QPixmap(image)
-            wid.setIcon(QIcon(pixmap))
-
             # ensure the dialog has enough space
             wid.setFixedHeight(80)
             wid.setMinimumWidth(500)
             wid.setIconSize(QSize(60, 60))
             wid.setStyleSheet("font-size: 20px")  # this is how one modifies the textsize of QLabels
             layout.addWidget(wid)  # add each Button to the Dialog
+            self.buttons.append(wid)
         self.setLayout(layout)
-        self.setMinimumSize(550, len(songs)*80+60)
+        self.setMinimumSize(550, placeholders*80+60)
+        self.thumbnail_loaded.connect(self.show_thumbnail)
+
+    def show_results(self, songs: list[lib.Song] | None):
+        """fills the placeholders with the found songs (None if the search failed)"""
+        if not songs:  # nothing to choose -> the placeholders make way for a message
+            self.message.setText("searching failed" if songs is None else "no results")
+            self.message.show()
+            for wid in self.buttons:
+                wid.hide()
+            return
+        self.songs = songs[:len(self.buttons)]
+        for i, wid in enumerate(self.buttons):
+            if i >= len(self.songs):  # less songs than expected
+                wid.hide()
+                continue
+            song = self.songs[i]
+            wid.setText(song.title + " - " + song.artist)  # create a Button with TITLE - ARTIST label
+            wid.setEnabled(True)
+            # and give each Button a covericon (all are loaded at the same time)
+            if song.thumbnail:
+                lib.thumbnails.fetch(song.thumbnail).add_done_callback(partial(self.thumbnail_fetched, i))
+
+    def thumbnail_fetched(self, i: int, future: Future):
+        """passes a loaded thumbnail to the Mainthread"""
+        if future.exception() is None:
+            try:
+                self.thumbnail_loaded.emit(i, future.result())
+            except RuntimeError:  # the dialog was already closed
+                pass
+
+    def show_thumbnail(self, i: int, data: bytes):
+        """displays a thumbnail as the icon of the i-th button"""
+        image = QImage()
+        image.loadFromData(data)
+        self.buttons[i].setIcon(QIcon(QPixmap(image)))
 
 
 class NewPlaylistDialog(QDialog):
@@ -373,8 +581,9 @@ class SongsWidget(PlaylistWidget):
     """a widget to show all songs"""
 
     def __init__(self) -> None:
-        playlist = lib.Pointer(list(song_data.val.keys()))  # the playlist for this widget is just all songs in the db
+        playlist = lib.Playlist(list(song_data.val.keys()), journaled=False)  # the playlist for this widget is just all songs in the db (never saved)
         super().__init__(playlist)
+        song_data.subscribe(self.on_songs_change)  # and follows the changes of the db
 
         # one cannot add a song only to the db -> remove junk only made for the playlist
         self.layout().removeWidget(self.search)  # type: ignore
@@ -384,16 +593,20 @@ class SongsWidget(PlaylistWidget):
 
     def remove_song(self, n):
         """deletes a song from the db"""
-        del song_data.val[self.playlist.val[n]]
-        super().remove_song(n)
-
-    def refresh(self):
-        # adjusted to accout for the playlist being generated as all songs in the db
-        if self.playlisthash != hash(song_data):  # check if playlist is up to date
-            self.playlist = lib.Pointer(list(song_data.val.keys()))  # if not gets the new playlist
-            self.playlisthash = 0  # ensures that the refresh regenerates the layout
-            super().refresh()
-            self.playlisthash = hash(song_data)  # remember the state of the playlist
+        lib.delete_songs([self.playlist.val[n]])  # from the playlists too (and from this one by following the db)
+
+    def on_songs_change(self, pointer: lib.Pointer, change: dict):
+        """keeps the playlist in line with the db"""
+        with self.playlist.lock:
+            match change:
+                case {"op": "set", "key": song_id}:
+                    if song_id not in self.playlist.val:  # new songs are added at the end
+                        self.playlist.append(song_id)
+                case {"op": "del", "key": song_id}:
+                    if song_id in self.playlist.val:
+                        self.playlist.val.remove(song_id)
+                case _:
+                    self.playlist.val = list(song_data.val.keys())
 
 
 class PlayerWidget(QWidget, lib.MusicPlayer):
@@ -467,28 +680,24 @@ class PlayerWidget(QWidget, lib.MusicPlayer):
         h, w = size.height(), size.width()
         return min(h - 150, w - PlaylistWidget.minimumwidth)  # either the Windowheight - space for title & buttons or Windowwidth - space for the Playlistwidgets
 
-    def query(self):
-        # adjusted to also update the progressbar
-        self.setMinimumWidth(self.get_icon_scale() + 20)
-        if self.playlist != []:
-            super().query()
-            song: str | None = self.song
-            if song:
-                try:  # tries to update the progressbar
-                    self.prog_bar.setValue(int(self.timer))
-                    self.prog_bar.setFormat(f"{lib.format_time(int(self.timer))} - {song_data.val[song]['duration']}")
-                except KeyError:  # if playing a song not in the db anymore
-                    del self.playlist[self.counter]  # stop playing the current song
-                    self.counter = self.counter % len(self.playlist)
-                    self.proc.stop()
+    def progressed(self, seconds: int):
+        # adjusted to update the progressbar
+        song: str | None = self.song
+        if song:
+            try:  # tries to update the progressbar
+                self.prog_bar.setValue(seconds)
+                self.prog_bar.setFormat(f"{lib.format_time(seconds)} - {song_data.val[song].duration}")
+            except KeyError:  # if playing a song not in the db anymore
+                self.proc.stop()  # stop playing the current song
+                self.ended()
 
     def play(self, file: Path):
         # adjusted to set songcover, background color and title
         super().play(file)  # actually play the song
 
         song = file.stem  # gets the songs ID
-        self.title.setText(song_data.val[song]['title'])  # displays the Title of the song in the corresponding Widget
-        self.prog_bar.setRange(0, song_data.val[song]["duration_seconds"])  # and sets the progressbar to the range of the song
+        self.title.setText(song_data.val[song].title)  # displays the Title of the song in the corresponding Widget
+        self.prog_bar.setRange(0, song_data.val[song].duration_seconds)  # and sets the progressbar to the range of the song
 
         cover, color = song_cover_info(song, self.get_icon_scale())  # retreives info about the current cover
         self.Icon.setPixmap(cover)  # displays the cover
@@ -499,31 +708,125 @@ class PlayerWidget(QWidget, lib.MusicPlayer):
         self.setPalette(colors)
 
 
-def song_cover_info(song_id: str, scale=60) -> tuple[QPixmap, QColor]:
-    """returns a Icon and the basecolor of the icon of the cover of a specific song"""
-    # this works as YTdlp embeds thumbnails into mp3s and YTMusic thumbnails (which are rectangular) contain a quadratic cover infront of a basecolor matching the cover
-    file = lib.song_file(song_id)  # gets the file for the song
-    metadata: eyed3.AudioFile = eyed3.load(file)  # reads metadata about the song with eyeD3 # type: ignore
-    image = QImage.fromData(metadata.tag.images[0].image_data)  # reads the thumbnail of the mp3 # type: ignore
-    color = image.pixelColor(1, 1)  # reads the color of the topmost pixel
-    width, height = image.width(), image.height()
-
-    image = image.copy(int((width - height) / 2), 0, height, height)  # the actual cover is a centere square
-
-    pixmap = QPixmap.fromImage(image)  # generate a Pixmap to be used in labels as Icons
-    return pixmap.scaledToHeight(scale), color
+def cover_data(file: Path) -> bytes | None:
+    """reads the cover embedded in a song file (depending on the format) or the thumbnail stored next to it"""
+    try:
+        match file.suffix:
+            case ".mp3":
+                metadata: eyed3.AudioFile = eyed3.load(file)  # reads metadata about the song with eyeD3 # type: ignore
+                return metadata.tag.images[0].image_data  # type: ignore
+            case ".m4a":
+                return bytes(mutagen.mp4.MP4(file).tags["covr"][0])  # type: ignore
+            case ".opus" | ".ogg":
+                # vorbis comments store the cover as a base64 encoded flac picture
+                picture = mutagen.File(file).tags["metadata_block_picture"][0]  # type: ignore
+                return mutagen.flac.Picture(base64.b64decode(picture)).data
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError, OSError, mutagen.MutagenError):
+        pass
+    # containers that can't embed a cover have the thumbnail next to them
+    for thumbnail in file.parent.glob(f"{glob.escape(file.stem)}.*"):
+        if thumbnail.suffix in (".jpg", ".jpeg", ".png", ".webp"):
+            return thumbnail.read_bytes()
+    return None
+
+
+class CoverCache:
+    """keeps the square covers and basecolors of songs, so songfiles don't have to be parsed again and again.
+    each cover is extracted once, stored in a few sizes in the directory and its basecolor in an index together with the mtime of the songfile,
+    songfiles with another mtime are extracted again. the most recently used pixmaps are also kept in memory"""
+    sizes = (60, 600)  # the stored variants
+
+    def __init__(self, directory: Path, size: int = 512):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.index = lib.Pointer({})  # song_id -> {"mtime": mtime of the songfile, "color": basecolor or None without a cover}
+        lib.data.load(directory.joinpath("index"), self.index, {})
+        self.pixmaps: OrderedDict[tuple[str, int], QPixmap] = OrderedDict()  # (song_id, scale) -> pixmap, the least recently used first
+        self.size = size
+
+    def variant(self, song_id: str, size: int) -> Path:
+        """returns the file of a stored size of a cover"""
+        return self.directory.joinpath(f"{song_id}_{size}.png")
+
+    def entry(self, song_id: str) -> dict | None:
+        """returns the indexentry of a song (None if it has no file) and extracts the cover if the songfile changed"""
+        file = lib.song_file(song_id)
+        try:
+            mtime = file.stat().st_mtime
+        except OSError:
+            return None
+        entry = self.index.val.get(song_id)
+        if entry is None or entry["mtime"] != mtime:
+            entry = self.extract(song_id, file, mtime)
+        return entry
+
+    def extract(self, song_id: str, file: Path, mtime: float) -> dict:
+        """reads the cover of a songfile and stores the variants and the basecolor"""
+        # this works as YTdlp embeds thumbnails into songs and YTMusic thumbnails (which are rectangular) contain a quadratic cover infront of a basecolor matching the cover
+        data = cover_data(file)
+        image = QImage.fromData(data) if data is not None else QImage()
+        if image.isNull():  # songs without a cover get an empty one
+            entry = {"mtime": mtime, "color": None}
+        else:
+            color = image.pixelColor(1, 1)  # reads the color of the topmost pixel
+            width, height = image.width(), image.height()
+            image = image.copy(int((width - height) / 2), 0, height, height)  # the actual cover is a centere square
+            for size in self.sizes:
+                scaled = image.scaledToHeight(min(size, height), Qt.TransformationMode.SmoothTransformation)
+                scaled.save(str(self.variant(song_id, size)), "PNG")
+            entry = {"mtime": mtime, "color": color.name()}
+        self.index.val[song_id] = entry
+        for key in [key for key in self.pixmaps if key[0] == song_id]:  # forget the pixmaps of the old cover
+            del self.pixmaps[key]
+        return entry
+
+    @staticmethod
+    def empty(scale: int) -> tuple[QPixmap, QColor]:
+        """returns the cover of songs without one"""
+        pixmap = QPixmap(scale, scale)
+        pixmap.fill(QColor("gray"))
+        return pixmap, QColor("gray")
+
+    def get(self, song_id: str, scale: int, retry: bool = True) -> tuple[QPixmap, QColor]:
+        """returns the cover scaled to a height and the basecolor of a song"""
+        entry = self.entry(song_id)
+        if entry is None or entry["color"] is None:
+            return self.empty(scale)
+        key = (song_id, scale)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap, QColor(entry["color"])
+        # loads the smallest stored variant which is big enough
+        size = next((size for size in self.sizes if size >= scale), self.sizes[-1])
+        pixmap = QPixmap(str(self.variant(song_id, size)))
+        if pixmap.isNull():  # the variant was deleted, so it is extracted again
+            if not retry:
+                return self.empty(scale)
+            del self.index.val[song_id]
+            return self.get(song_id, scale, retry=False)
+        if pixmap.height() != scale:
+            pixmap = pixmap.scaledToHeight(scale, Qt.TransformationMode.SmoothTransformation)
+        self.pixmaps[key] = pixmap
+        if len(self.pixmaps) > self.size:
+            self.pixmaps.popitem(last=False)
+        return pixmap, QColor(entry["color"])
+
+
+covers: CoverCache  # placeholder for the CoverCache (pixmaps can only be created once the QApplication exists)
 
 
-def clear_layout(layout: QLayout):
-    """deletes all Widgets from a layout"""
-    for i in reversed(range(layout.count())):
-        layout.itemAt(i).widget().setParent(None)  # type: ignore
+def song_cover_info(song_id: str, scale=60) -> tuple[QPixmap, QColor]:
+    """returns a Icon and the basecolor of the icon of the cover of a specific song"""
+    return covers.get(song_id, scale)
 
 
 def main(on_start: Callable = lambda: None):
     """initialises the GUI. on_start is a callable and executed right before the mainloop"""
+    global covers
     # creates the QApplication
     app = QApplication(sys.argv)
+    covers = CoverCache(lib.data_dir.joinpath("covers"))
 
     # tries to apply the theme specified in the config
     theme = lib.config.val["theme"]
@@ -541,7 +844,7 @@ def main(on_start: Callable = lambda: None):
         app.exec()
     finally:  # and stops playing music & saves everything if the window is closed
         player.proc.stop()
-        lib.data.save_all()
+        lib.saver.flush()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,9 @@
 import curses
+import os
+import queue
+import selectors
+import signal
+import sys
 from typing import Callable
 
 # these imports are run this way so they work if run as a module
@@ -8,6 +13,47 @@ except (ModuleNotFoundError, ImportError):
     import catvibes_lib as lib  # or by executing the file directly
 
 
+class Calls:
+    """functions other threads (or signal handlers) want to run in the mainloop.
+    with wakeup putting one also writes to a pipe, so the mainloop can sleep in a selector until there is something to do"""
+
+    def __init__(self, wakeup: bool):
+        self.queue: queue.SimpleQueue[Callable] = queue.SimpleQueue()
+        self.read: int | None = None
+        self.write: int | None = None
+        if wakeup:  # not on windows, where os.set_blocking doesn't exist for pipes (before 3.12) and the mainloop polls anyway
+            self.read, self.write = os.pipe()
+            os.set_blocking(self.read, False)
+            os.set_blocking(self.write, False)
+
+    def fileno(self) -> int:
+        return self.read
+
+    def put(self, func: Callable):
+        """queues a function and wakes up the mainloop"""
+        self.queue.put(func)
+        if self.write is None:
+            return
+        try:
+            os.write(self.write, b"\0")
+        except BlockingIOError:  # the pipe is full so the mainloop will wake up anyway
+            pass
+
+    def run(self) -> bool:
+        """runs all queued functions and returns whether there were any"""
+        if self.read is not None:
+            try:
+                while os.read(self.read, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+        ran = False
+        while not self.queue.empty():
+            self.queue.get()()
+            ran = True
+        return ran
+
+
 def ui(screen, on_start: Callable):
     """the main function running the UI"""
     # establishes a empty base screen
@@ -34,72 +80,117 @@ def ui(screen, on_start: Callable):
 
     lib.music_player = lib.MusicPlayerWithScreen(music_player_screen)
 
+    # the mainloop sleeps until a key is pressed or a function is queued (windows can't select on the terminal so it checks every 100 ms instead)
+    polling = not hasattr(signal, "SIGWINCH")
+    # functions from other threads (like finished downloads or player events) are run in the mainloop as curses isn't threadsafe
+    calls = Calls(wakeup=not polling)
+    lib.downloads.dispatch = calls.put
+    lib.music_player.dispatch = calls.put  # type: ignore
+
     def tabbar():
-        """draws the tabbar and seperator lines"""
-        cursor = 0  # where the cursor is currently placed
+        """draws the tabbar with the progress of running downloads at its right end"""
+        parts = []
         for t in tabs:  # draw every tab
-            if tabs[tab] == t:
-                lib.addstr(screen, 0, cursor, t.title, curses.A_REVERSE)  # and the selected tab is highlighted
-            else:
-                lib.addstr(screen, 0, cursor, t.title)
-            cursor += len(t.title) + 4
+            parts.append((t.title, curses.A_REVERSE if tabs[tab] == t else curses.A_NORMAL))  # and the selected tab is highlighted
             if t != tabs[-1]:
-                lib.addstr(screen, 0, cursor - 2, "│")  # with a seperator between the tabs
-
-        # also draw some horizontal lines to seperate tabbar, the tab itself and the musicplayer
+                parts.append(("  │ ", curses.A_NORMAL))  # with a seperator between the tabs
+        status = lib.downloads.status()
+        width = sum(len(text) for text, _ in parts)
+        parts.append((" " * max(maxx - width - len(status), 1) + status, curses.A_NORMAL))
+        lib.Frame.of(screen).draw({0: tuple(parts)})  # only redrawn if something changed
+
+    def lines():
+        """draws some horizontal lines to seperate tabbar, the tab itself and the musicplayer"""
         screen.hline(1, 0, curses.ACS_HLINE, maxx)
         screen.hline(maxy - 1, 0, curses.ACS_HLINE, maxx)
+        screen.noutrefresh()
 
     def resize():
         """handles the event if the window resizes"""
         nonlocal maxx, maxy
+        if screen.getmaxyx() == (maxy + 1, maxx + 1):  # nothing to do if the dimensions are the same
+            return
         maxy, maxx = screen.getmaxyx()  # adjust the dimensions
         maxy, maxx = maxy - 1, maxx - 1
         playlist_screen.resize(maxy - sum(y_restrictions), maxx)  # adjust subscreens
         playlist_screen.mvwin(y_restrictions[0], 0)
         music_player_screen.resize(1, maxx)
         music_player_screen.mvwin(maxy, 0)
-
-    tabbar()  # show the tabbar
-    tabs[tab].disp()  # and the current screen
-    key = " "
-    on_start()  # run potential on_start code (like auto start playing)
-    lib.music_player.toggle()  # is a hack to allow instantplay but should not have negative sideeffects
-    while key not in ("q", "\x1b"):  # UI mainloop (exitable wit q or Esc)
-        if key == "KEY_RIGHT":  # with <- and -> go to the adjacend tabs
-            tab = (tab + 1) % len(tabs)
-        elif key == "KEY_LEFT":
-            tab = (tab - 1) % len(tabs)
-        elif key == "l":  # l creates a new playlist
-            # asks for the name of the playlist
-            name = lib.inputstr(playlist_screen, "Name of the playlist: ")
-            if name is not None:
-                # creates the new playlist and a corresponding file
-                temp = lib.Pointer([])
-                lib.data.load(lib.playlist_dir.joinpath(name), temp, default=[])
-                playlists.val[name] = temp
-                # and adds a new tab
-                tabs.append(lib.PlaylistTab(playlist_screen, name, temp))
-        else:  # all other key presses are passed down to the tab to handle accordingly
-            tabs[tab].handle_key(key)
+        # everything is drawn again
+        screen.clear()
+        lib.Frame.invalidate()
+        lines()
+        tabbar()
         tabs[tab].disp()
+        lib.music_player.disp()  # type: ignore
 
-        screen.timeout(100)
+    lib.downloads.listeners.append(lambda download: tabbar())  # updates the download progress whenever it changes
 
-        # check for windowchanges
-        resize()
-        tabbar()
+    selector = selectors.DefaultSelector()
+    if not polling:
+        selector.register(sys.stdin, selectors.EVENT_READ)
+        selector.register(calls, selectors.EVENT_READ)
 
-        # waits for the next keypress but periodically refreshes the screen and musicplayer
-        key = -1
-        while key == -1:
+        def on_winch():
+            """tells curses about the new size of the terminal"""
+            columns, lines = os.get_terminal_size(sys.__stdout__.fileno())
+            curses.resizeterm(lines, columns)
             resize()
+        previous_handler = signal.signal(signal.SIGWINCH, lambda signum, frame: calls.put(on_winch))  # type: ignore
+        signal.siginterrupt(signal.SIGWINCH, False)  # the prompts wait in getkey() and shouldn't be interrupted by a resize
+        screen.nodelay(True)  # getkey() only returns keys that are already there
+    else:
+        screen.timeout(100)
+
+    def next_key() -> str:
+        """waits for the next keypress and meanwhile runs what other threads want to do with the UI"""
+        while True:
             try:
-                key = screen.getkey()
-            except curses.error:
-                key = -1
-            lib.music_player.query()
-        screen.timeout(-1)
+                return screen.getkey()
+            except curses.error:  # no key yet
+                pass
+            if polling:
+                resize()
+            else:
+                selector.select()  # sleeps until there is input or a queued function
+            if calls.run():
+                tabs[tab].update()  # the tab is only drawn again if the calls changed its songs (the player draws itself)
+                curses.doupdate()
+
+    try:
+        lines()
+        tabbar()  # show the tabbar
+        tabs[tab].disp()  # and the current screen
+        curses.doupdate()
+        key = " "
+        on_start()  # run potential on_start code (like auto start playing)
+        lib.music_player.toggle()  # is a hack to allow instantplay but should not have negative sideeffects
+        while key not in ("q", "\x1b"):  # UI mainloop (exitable wit q or Esc)
+            if key == "KEY_RIGHT":  # with <- and -> go to the adjacend tabs
+                tab = (tab + 1) % len(tabs)
+            elif key == "KEY_LEFT":
+                tab = (tab - 1) % len(tabs)
+            elif key == "l":  # l creates a new playlist
+                # asks for the name of the playlist
+                name = lib.inputstr(playlist_screen, "Name of the playlist: ")
+                if name is not None:
+                    # creates the new playlist and a corresponding file
+                    temp = lib.Playlist()
+                    lib.data.load(lib.playlist_dir.joinpath(name), temp, default=[])
+                    playlists.val[name] = temp
+                    # and adds a new tab
+                    tabs.append(lib.PlaylistTab(playlist_screen, name, temp))
+            else:  # all other key presses are passed down to the tab to handle accordingly
+                tabs[tab].handle_key(key)
+            tabs[tab].disp()
+            tabbar()
+            curses.doupdate()  # sends everything that changed to the terminal at once
+
+            key = next_key()
+    finally:  # the handler must not outlive the UI, even if it crashed
+        if not polling:
+            signal.signal(signal.SIGWINCH, previous_handler)
+        selector.close()
 
 
 def main(on_start: Callable = lambda: None):
@@ -115,7 +206,7 @@ def main(on_start: Callable = lambda: None):
     finally:
         lib.music_player.proc.stop()  # stops the music
         curses.curs_set(1)  # makes the cursor visible again (for further terminal using purposes)
-        lib.data.save_all()  # saves everything
+        lib.saver.flush()  # saves everything
 
 
 if __name__ == "__main__":